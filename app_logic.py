@@ -286,6 +286,9 @@ class SuperSexySteamLogic:
         try:
             games = self.db.get_installed_games()
             
+            # Fetch depots for all games in one batch instead of one query per game
+            depots_by_appid = self.db.get_depots_for_appids([game['app_id'] for game in games if game.get('app_id')])
+            
             # Add depot information to each game
             for game in games:
                 app_id = game.get('app_id')
@@ -294,7 +297,7 @@ class SuperSexySteamLogic:
                 if app_id:
                     try:
                         # Get depot data for this app
-                        depot_data = self.db.get_appid_depots(app_id)
+                        depot_data = depots_by_appid.get(app_id, [])
                         if depot_data:
                             # Convert to list of depot dictionaries
                             for depot in depot_data:
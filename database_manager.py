@@ -4,7 +4,14 @@
 # This module handles all database operations including AppID and depot management,
 # tracking installation status, and providing data for the workflow modules.
 
+import atexit
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import json
 import logging
+import queue
+import shutil
 import sqlite3
 from pathlib import Path
 import threading
@@ -13,6 +20,56 @@ from typing import List, Dict, Optional, Tuple
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Maximum number of AppIDs bound in a single "IN (...)" query. Kept below
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER (999 on older builds).
+MAX_QUERY_VARIABLES = 900
+
+# Current schema version, stored in the database via PRAGMA user_version.
+# Bump this whenever the schema in _init_database changes.
+SCHEMA_VERSION = 8
+
+# Maximum number of read-only connections kept in the reader pool.
+READER_POOL_SIZE = 4
+
+# Seconds a read waits on a full reader pool before checking again. close() swaps in
+# a new pool, and nothing is ever returned to the old one a reader may be waiting on.
+READER_WAIT_TIMEOUT = 1.0
+
+# Concurrent Steam Store lookups in update_missing_game_names. Matches the HTTP
+# connection pool in steam_game_search and stays low enough to avoid rate limiting.
+NAME_LOOKUP_WORKERS = 16
+
+# Seconds between background PRAGMA optimize runs for long-lived sessions.
+OPTIMIZE_INTERVAL = 3600
+
+# Prepared statements cached per connection, keyed by SQL text. The chunked IN (...)
+# lookups generate one statement per chunk length, so leave headroom above the
+# default of 128 to keep them from evicting the fixed per-method queries.
+STATEMENT_CACHE_SIZE = 256
+
+# Settings applied once to every connection: 64 MiB page cache and 256 MB memory-mapped I/O.
+# Both are upper bounds; memory is only used as the database grows.
+CONNECTION_PRAGMAS = """
+    PRAGMA cache_size=-65536;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+"""
+
+# Writer-only settings. connect(timeout=30.0) already installs the busy handler,
+# so no separate busy_timeout is needed.
+WRITER_PRAGMAS = """
+    PRAGMA foreign_keys=ON;
+    PRAGMA synchronous=NORMAL;
+"""
+
+# WAL settings for file-backed databases. journal_size_limit shrinks the WAL back
+# to 64 MB after checkpoints instead of keeping its high-water mark.
+WAL_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA wal_autocheckpoint=1000;
+    PRAGMA journal_size_limit=67108864;
+"""
+
 
 class GameDatabaseManager:
     """
@@ -29,19 +86,89 @@ class GameDatabaseManager:
         """
         logger.info(f"Initializing GameDatabaseManager with database: {db_path}")
         self.db_path = Path(db_path)
-        self._lock = threading.Lock()
+        # Serialises access to the single writer connection. Re-entrant so corruption
+        # recovery can rebuild the schema while a session holds the lock.
+        self._write_lock = threading.RLock()
         logger.debug("Database lock created")
+        # WAL allows one writer alongside many readers, so reads use a separate pool of
+        # read-only connections that never wait on _write_lock. _connections tracks every
+        # open connection so close() can release them; _borrowed holds the readers
+        # currently lent out, which close() leaves for _read_conn to close on return.
+        self._writer = None
+        self._readers = queue.Queue()
+        self._reader_count = 0
+        self._pool_lock = threading.Lock()
+        self._connections = set()
+        self._borrowed = set()
+        # AppIDs present in the database, loaded on first is_appid_exists() call and kept
+        # in step with add/remove so membership checks skip the database entirely
+        self._existing_app_ids: Optional[set] = None
+        # Per-AppID results of get_appid_depots, dropped whenever a write touches that
+        # AppID's depots. The generation counter stops a read that raced with a write
+        # from storing the pre-write rows after they were invalidated.
+        self._depot_cache: Dict[str, List[Dict[str, str]]] = {}
+        self._depot_cache_generation = 0
+        self._depot_cache_lock = threading.Lock()
+        # Periodic optimize/maintenance timer, started whenever the writer connection
+        # opens and cancelled by close(). _closing stops close()'s own final optimize
+        # from starting it again.
+        self._optimize_timer: Optional[threading.Timer] = None
+        self._closing = False
         self._init_database()
+        atexit.register(self.close)
         logger.info("GameDatabaseManager initialized successfully")
     
+    def _enable_incremental_vacuum(self):
+        """
+        Make sure the database uses incremental auto-vacuum.
+        
+        Incremental auto-vacuum lets maintenance() reclaim free pages cheaply. New files
+        get it from _get_connection before their first table; a file that already has
+        tables without it (including any created by older releases) needs a one-time
+        VACUUM, which is the only way to change the setting once the file is in WAL mode.
+        """
+        with self._session() as conn:
+            if conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:
+                return
+            has_tables = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' LIMIT 1").fetchone()
+            conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            if has_tables:
+                logger.info("Converting database to incremental auto-vacuum")
+                conn.execute('VACUUM')
+            mode = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+        
+        if mode != 2 and str(self.db_path) != ':memory:':
+            logger.warning(f"Incremental auto-vacuum could not be enabled (auto_vacuum={mode})")
+    
     def _init_database(self):
         """Initialize the database schema."""
         logger.debug("Initializing database schema")
-        with self._lock:
-            try:
-                conn = self._get_connection()
+        try:
+            # Quick integrity check once at startup rather than on every connection.
+            # A rebuild calls back into _init_database on the fresh file.
+            if not self.verify_integrity(full=False):
+                return
+            
+            self._enable_incremental_vacuum()
+            
+            with self._session() as conn:
+                user_version = conn.execute('PRAGMA user_version').fetchone()[0]
+            
+            # Skip schema setup entirely if this database is already current
+            if user_version >= SCHEMA_VERSION:
+                logger.debug(f"Database schema is up to date (version {user_version})")
+                return
+            
+            logger.info(f"Upgrading database schema from version {user_version} to {SCHEMA_VERSION}")
+            
+            self._rename_rowid_tables()
+            
+            with self._session(write=True) as conn:
                 cursor = conn.cursor()
                 
+                # The TEXT-keyed tables are WITHOUT ROWID: the primary key B-tree is the
+                # table itself rather than a separate index over a hidden rowid.
+                
                 # Create AppIDs table
                 logger.debug("Creating appids table")
                 cursor.execute('''
@@ -52,7 +179,7 @@ class GameDatabaseManager:
                         last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         is_installed BOOLEAN DEFAULT 1,
                         achievements_generated BOOLEAN DEFAULT 0
-                    )
+                    ) WITHOUT ROWID
                 ''')
                 
                 # Create Depots table
@@ -66,7 +193,7 @@ class GameDatabaseManager:
                         date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         PRIMARY KEY (depot_id, app_id),
                         FOREIGN KEY (app_id) REFERENCES appids (app_id) ON DELETE CASCADE
-                    )
+                    ) WITHOUT ROWID
                 ''')
 
                 # Create Manifests table to track manifest files for robust cleanup
@@ -78,7 +205,7 @@ class GameDatabaseManager:
                         date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         PRIMARY KEY (app_id, filename),
                         FOREIGN KEY (app_id) REFERENCES appids (app_id) ON DELETE CASCADE
-                    )
+                    ) WITHOUT ROWID
                 ''')
 
                 # Create User Data table to store user information like SteamID
@@ -92,45 +219,139 @@ class GameDatabaseManager:
                     )
                 ''')
                 
+                # Databases created by older releases may predate some columns, and
+                # CREATE TABLE IF NOT EXISTS leaves them untouched. Adding a column that
+                # already exists raises "duplicate column name", which is safe to ignore.
+                for table, column in (('appids', 'game_name TEXT'),
+                                      ('appids', 'achievements_generated BOOLEAN DEFAULT 0'),
+                                      ('depots', "depot_name TEXT DEFAULT 'No Name'")):
+                    try:
+                        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column}')
+                        logger.info(f"Added missing column to {table}: {column}")
+                    except sqlite3.OperationalError:
+                        pass
+                
+                # Copy rows out of the rowid tables set aside by _rename_rowid_tables,
+                # parents first so the foreign keys hold. Orphaned or NULL-keyed rows,
+                # which rowid tables allowed, are dropped.
+                for table in ('appids', 'depots', 'manifests'):
+                    legacy = f'{table}_rowid'
+                    if not cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (legacy,)).fetchone():
+                        continue
+                    columns = ', '.join(row[1] for row in cursor.execute(f'PRAGMA table_info({legacy})').fetchall())
+                    where = '' if table == 'appids' else ' WHERE app_id IN (SELECT app_id FROM appids)'
+                    cursor.execute(f'INSERT OR IGNORE INTO {table} ({columns}) SELECT {columns} FROM {legacy}{where}')
+                    cursor.execute(f'DROP TABLE {legacy}')
+                    logger.info(f"Rebuilt {table} as a WITHOUT ROWID table")
+                
                 # Create indices for better performance
                 logger.debug("Creating database indices")
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_depots_app_id ON depots (app_id)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_appids_installed ON appids (is_installed)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_manifests_app_id ON manifests (app_id)')
-                
-                conn.commit()
-                conn.close()
-                logger.info("Database schema initialized successfully")
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to initialize database: {e}")
-                logger.debug("Database initialization exception:", exc_info=True)
-                raise
+                # Covering indexes for per-app depot lookups: every depots column the queries read
+                # is in the index, so rows never need to be fetched from the table itself.
+                # Leading with (app_id, depot_id) hands rows back already in ORDER BY order, so
+                # no temp B-tree sort is needed. The partial index holds only keyed depots and
+                # serves the installed-games joins that filter on decryption_key IS NOT NULL.
+                cursor.execute('DROP INDEX IF EXISTS idx_depots_app_id')
+                cursor.execute('DROP INDEX IF EXISTS idx_depots_app_key')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_depots_app_depot ON depots (app_id, depot_id, decryption_key, depot_name)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_depots_keyed ON depots (app_id, depot_id, depot_name, decryption_key) WHERE decryption_key IS NOT NULL')
+                # The manifests primary key already leads with app_id
+                cursor.execute('DROP INDEX IF EXISTS idx_manifests_app_id')
+                
+                # Partial indices covering only installed apps, so the installed-app listings
+                # can walk the index in ORDER BY order instead of sorting the result.
+                # These supersede the old full index on is_installed.
+                cursor.execute('DROP INDEX IF EXISTS idx_appids_installed')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_appids_installed_appid ON appids (app_id) WHERE is_installed = 1')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_appids_installed_name ON appids (game_name, app_id) WHERE is_installed = 1')
+                # appids is WITHOUT ROWID, so its primary key already orders rows by app_id;
+                # a full (app_id, is_installed) index only shadowed the partial one above
+                cursor.execute('DROP INDEX IF EXISTS idx_appids_app_installed')
+                
+                # Gather statistics so the planner prefers the covering indices on upgraded databases
+                cursor.execute('ANALYZE depots')
+                cursor.execute('ANALYZE appids')
+                
+                cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+                
+            # Seed query planner statistics for the new schema
+            with self._session() as conn:
+                conn.execute('PRAGMA optimize')
+            logger.info("Database schema initialized successfully")
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to initialize database: {e}")
+            logger.debug("Database initialization exception:", exc_info=True)
+            raise
+    
+    def _rename_rowid_tables(self):
+        """
+        Set aside tables that older releases created as rowid tables.
+        
+        Each is renamed to <table>_rowid so _init_database can create the WITHOUT ROWID
+        replacement under the original name and copy the rows across. Foreign keys and
+        the modern ALTER TABLE behaviour are switched off for the rename, so references
+        in the other tables keep pointing at the original names.
+        """
+        with self._session() as conn:
+            legacy_tables = [
+                name for name, sql in conn.execute(
+                    "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name IN ('appids', 'depots', 'manifests')"
+                ).fetchall()
+                if 'WITHOUT ROWID' not in sql.upper()
+            ]
+            if not legacy_tables:
+                return
+            
+            logger.info(f"Rebuilding rowid tables: {legacy_tables}")
+            # Neither pragma can change inside a transaction
+            conn.execute('PRAGMA foreign_keys=OFF')
+            conn.execute('PRAGMA legacy_alter_table=ON')
+            try:
+                with self._session(write=True) as conn:
+                    for table in legacy_tables:
+                        conn.execute(f'ALTER TABLE {table} RENAME TO {table}_rowid')
+            finally:
+                conn.execute('PRAGMA legacy_alter_table=OFF')
+                conn.execute('PRAGMA foreign_keys=ON')
     
     def _get_connection(self):
-        """Get a database connection with proper configuration and corruption checking."""
+        """
+        Get the writer connection, opening and configuring it on first use.
+        
+        Callers must hold _write_lock.
+        
+        Returns:
+            sqlite3.Connection: The shared writer connection.
+        """
+        if self._writer is not None:
+            return self._writer
+        
         logger.debug(f"Creating database connection to {self.db_path}")
         try:
-            conn = sqlite3.connect(str(self.db_path), timeout=30.0)
-            
-            # Test database integrity
-            cursor = conn.cursor()
-            cursor.execute('PRAGMA integrity_check')
-            integrity_result = cursor.fetchone()[0]
-            
-            if integrity_result != 'ok':
-                logger.warning(f"Database corruption detected: {integrity_result}")
-                conn.close()
-                return self._handle_database_corruption()
+            # Autocommit mode: write sessions manage BEGIN IMMEDIATE / COMMIT themselves
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False,
+                                   isolation_level=None, cached_statements=STATEMENT_CACHE_SIZE)
             
             # Configure connection for optimal performance and foreign key enforcement
             logger.debug("Configuring database connection settings")
-            conn.execute('PRAGMA foreign_keys=ON')
-            conn.execute('PRAGMA journal_mode=WAL')
-            conn.execute('PRAGMA synchronous=NORMAL')
-            conn.execute('PRAGMA cache_size=1000')
-            conn.execute('PRAGMA temp_store=memory')
+            # Applied in one executescript call; they persist for the life of the connection.
+            # WAL does not apply to in-memory databases.
+            pragmas = WRITER_PRAGMAS + CONNECTION_PRAGMAS
+            if str(self.db_path) != ':memory:':
+                # auto_vacuum only takes effect on a file without tables, and only before
+                # it switches to WAL; on an existing file this is a no-op and
+                # _init_database converts it with a VACUUM instead
+                pragmas = 'PRAGMA auto_vacuum=INCREMENTAL;' + WAL_PRAGMAS + pragmas
+            conn.executescript(pragmas)
             logger.debug("Database connection configured successfully")
+            
+            with self._pool_lock:
+                self._connections.add(conn)
+            self._writer = conn
+            # Also restarts periodic maintenance when the manager is reused after close()
+            if self._optimize_timer is None and not self._closing:
+                self._schedule_optimize()
             return conn
             
         except sqlite3.DatabaseError as e:
@@ -138,34 +359,219 @@ class GameDatabaseManager:
             logger.debug("Database connection error:", exc_info=True)
             return self._handle_database_corruption()
     
+    def _open_reader(self) -> Optional[sqlite3.Connection]:
+        """
+        Open a new read-only connection for the reader pool, already marked as borrowed.
+        
+        Returns:
+            Optional[sqlite3.Connection]: The new connection, or None if the pool is already full.
+        """
+        with self._pool_lock:
+            if self._reader_count >= READER_POOL_SIZE:
+                return None
+            self._reader_count += 1
+            pool = self._readers
+        
+        logger.debug(f"Opening read-only database connection to {self.db_path}")
+        try:
+            # Read-only WAL connections need the -shm file the writer creates
+            if self._writer is None:
+                with self._write_lock:
+                    self._get_connection()
+            conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True,
+                                   timeout=30.0, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+            conn.executescript(CONNECTION_PRAGMAS)
+        except sqlite3.Error:
+            with self._pool_lock:
+                if self._readers is pool:
+                    self._reader_count -= 1
+            raise
+        
+        with self._pool_lock:
+            # If close() replaced the pool meanwhile, the slot reserved above belonged
+            # to the retired pool: lend the connection out once, then close it
+            if self._readers is pool:
+                self._connections.add(conn)
+            self._borrowed.add(conn)
+        return conn
+    
+    def _borrow_reader(self, conn: sqlite3.Connection) -> bool:
+        """
+        Mark a connection taken from the reader pool as borrowed.
+        
+        Args:
+            conn (sqlite3.Connection): Connection taken from a reader pool.
+        
+        Returns:
+            bool: False if close() retired the pool it came from; close() closes it then.
+        """
+        with self._pool_lock:
+            if conn not in self._connections:
+                return False
+            self._borrowed.add(conn)
+            return True
+    
+    def _close_connections(self):
+        """
+        Close the writer and all idle pooled readers; they are reopened lazily on next use.
+        
+        Readers borrowed by other threads are retired instead and closed by _read_conn
+        when returned, so a running query never sees its connection closed.
+        """
+        with self._write_lock, self._pool_lock:
+            connections, self._connections = self._connections, set()
+            connections -= self._borrowed
+            self._borrowed = set()
+            writer, self._writer = self._writer, None
+            self._readers = queue.Queue()
+            self._reader_count = 0
+            # The file may be rebuilt or deleted once connections are released
+            self._existing_app_ids = None
+            self._invalidate_depot_cache()
+        # Close the writer last: only a connection that can write removes the WAL files
+        connections.discard(writer)
+        for conn in [*connections, writer]:
+            if conn is None:
+                continue
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"Error closing database connection: {e}")
+    
+    def _invalidate_depot_cache(self, app_ids: Optional[List[str]] = None):
+        """
+        Drop cached get_appid_depots results after a write.
+        
+        Args:
+            app_ids (List[str]): AppIDs whose depots changed, or None to drop everything.
+        """
+        with self._depot_cache_lock:
+            self._depot_cache_generation += 1
+            if app_ids is None:
+                self._depot_cache.clear()
+            else:
+                for app_id in app_ids:
+                    self._depot_cache.pop(app_id, None)
+    
+    @contextmanager
+    def _session(self, write: bool = False):
+        """
+        Hold the write lock and yield the writer connection.
+        
+        Write sessions run inside a BEGIN IMMEDIATE transaction that is committed
+        when the block completes and rolled back if it raises. Plain reads should
+        use _read_conn instead; errors are re-raised for the caller to log.
+        
+        Args:
+            write (bool): Whether the session modifies the database.
+        """
+        with self._write_lock:
+            conn = self._get_connection()
+            try:
+                if write:
+                    # Take the write lock up front so the transaction cannot fail later
+                    # with SQLITE_BUSY while upgrading from a read lock
+                    conn.execute('BEGIN IMMEDIATE')
+                yield conn
+                if write:
+                    conn.execute('COMMIT')
+            except Exception:
+                if write and conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                raise
+    
+    @contextmanager
+    def _read_conn(self):
+        """
+        Borrow a read-only connection from the pool without taking the write lock.
+        
+        Readers see the last committed state and can run while a write is in progress.
+        """
+        if str(self.db_path) == ':memory:':
+            # In-memory databases cannot be shared across connections
+            with self._session() as conn:
+                yield conn
+            return
+        
+        while True:
+            pool = self._readers
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                conn = self._open_reader()
+                if conn is not None:
+                    break
+                # The pool is full: wait for a connection, but re-read self._readers
+                # periodically in case close() replaced the pool meanwhile
+                try:
+                    conn = pool.get(timeout=READER_WAIT_TIMEOUT)
+                except queue.Empty:
+                    continue
+            if self._borrow_reader(conn):
+                break
+        try:
+            yield conn
+        finally:
+            # Return the connection to the current pool, or close it if close()
+            # retired its pool while it was borrowed
+            with self._pool_lock:
+                self._borrowed.discard(conn)
+                retired = conn not in self._connections
+                if not retired:
+                    self._readers.put(conn)
+            if retired:
+                try:
+                    conn.close()
+                except sqlite3.Error as e:
+                    logger.debug(f"Error closing database connection: {e}")
+    
+    def _backup_database(self, backup_path: Path):
+        """
+        Copy the database file to backup_path.
+        
+        Uses SQLite's online backup API, which copies page by page instead of
+        loading the whole file into memory. If the source is too damaged for
+        SQLite to read, falls back to a chunked raw file copy.
+        
+        Args:
+            backup_path (Path): Destination path for the backup.
+        """
+        try:
+            src = sqlite3.connect(str(self.db_path))
+            try:
+                dst = sqlite3.connect(str(backup_path))
+                try:
+                    src.backup(dst)
+                finally:
+                    dst.close()
+            finally:
+                src.close()
+        except sqlite3.DatabaseError as e:
+            logger.debug(f"Online backup failed, falling back to raw file copy: {e}")
+            with open(self.db_path, 'rb') as src_file, open(backup_path, 'wb') as dst_file:
+                shutil.copyfileobj(src_file, dst_file, length=1 << 20)
+
     def _handle_database_corruption(self):
         """Handle database corruption by creating a backup and rebuilding."""
         logger.warning("Handling database corruption")
         from datetime import datetime
-        import time
         
         # Create backup of corrupted database
         backup_path = self.db_path.with_suffix(f".corrupted_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
         try:
             if self.db_path.exists():
                 logger.info(f"Attempting to backup corrupted database to: {backup_path}")
-                # Try to close any existing connections first
-                time.sleep(0.1)  # Brief pause to allow connections to close
+                # Release cached connections so the file can be copied and removed
+                self._close_connections()
                 
-                # Attempt backup with retry
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        backup_path.write_bytes(self.db_path.read_bytes())
-                        logger.info(f"Corrupted database backed up to: {backup_path}")
-                        break
-                    except (OSError, IOError) as e:
-                        if attempt < max_retries - 1:
-                            logger.debug(f"Backup attempt {attempt + 1} failed, retrying: {e}")
-                            time.sleep(0.5)  # Wait before retry
-                            continue
-                        else:
-                            logger.warning(f"Could not backup corrupted database after {max_retries} attempts: {e}")
+                # Our own connections are closed, so nothing here holds the file open;
+                # a failed backup will not succeed on retry and must not delay the rebuild
+                try:
+                    self._backup_database(backup_path)
+                    logger.info(f"Corrupted database backed up to: {backup_path}")
+                except (OSError, IOError) as e:
+                    logger.warning(f"Could not backup corrupted database: {e}")
                 
                 # Try to remove corrupted file
                 try:
@@ -191,12 +597,7 @@ class GameDatabaseManager:
         # Return new connection
         try:
             logger.debug("Creating new connection after rebuild")
-            conn = sqlite3.connect(str(self.db_path), timeout=30.0)
-            conn.execute('PRAGMA foreign_keys=ON')
-            conn.execute('PRAGMA journal_mode=WAL')
-            conn.execute('PRAGMA synchronous=NORMAL')
-            conn.execute('PRAGMA cache_size=1000')
-            conn.execute('PRAGMA temp_store=memory')
+            conn = self._get_connection()
             logger.info("Database corruption handled successfully")
             return conn
         except Exception as e:
@@ -219,65 +620,107 @@ class GameDatabaseManager:
         """
         logger.info(f"Adding AppID {app_id} with {len(depots)} depots and {len(manifest_files)} manifest files")
         logger.debug(f"Game name: {game_name}")
+        return self.add_many_appids_with_depots([(app_id, depots, manifest_files, game_name)])
+        
+    def add_many_appids_with_depots(self, items: List[Tuple[str, List[Dict[str, str]], List[str], Optional[str]]]) -> bool:
+        """
+        Add several AppIDs with their depots and manifest files in one transaction.
+        
+        Each item replaces that AppID's depots and manifests exactly as
+        add_appid_with_depots does; either every item is written or none is.
+        Prefer this over calling add_appid_with_depots in a loop, which commits
+        and syncs once per AppID.
         
+        Args:
+            items (List[Tuple]): (app_id, depots, manifest_files, game_name) tuples,
+                with the same meaning as the add_appid_with_depots arguments
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
         # Validate input
-        if not app_id or not isinstance(app_id, str) or not app_id.strip():
-            logger.error("app_id must be a non-empty string")
-            raise ValueError("app_id must be a non-empty string")
+        for app_id, _, _, _ in items:
+            if not app_id or not isinstance(app_id, str) or not app_id.strip():
+                logger.error("app_id must be a non-empty string")
+                raise ValueError("app_id must be a non-empty string")
+        
+        # An AppID listed twice keeps its last entry, as sequential adds would
+        batch = {app_id: (depots, manifest_files, game_name) for app_id, depots, manifest_files, game_name in items}
+        if not batch:
+            return True
+        
+        app_rows = [(app_id, game_name) for app_id, (_, _, game_name) in batch.items()]
+        app_id_rows = [(app_id,) for app_id in batch]
+        depot_rows = [
+            (depot['depot_id'], app_id, depot.get('depot_key'), depot.get('depot_name', 'No Name'))
+            for app_id, (depots, _, _) in batch.items()
+            for depot in depots if depot.get('depot_id')
+        ]
+        manifest_rows = [
+            (app_id, filename)
+            for app_id, (_, manifest_files, _) in batch.items()
+            for filename in manifest_files if filename
+        ]
             
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                # Insert or update the AppID
-                logger.debug(f"Inserting/updating AppID {app_id} in database")
-                cursor.execute('''
-                    INSERT OR REPLACE INTO appids (app_id, game_name, last_updated, is_installed)
-                    VALUES (?, ?, CURRENT_TIMESTAMP, 1)
-                ''', (app_id, game_name))
-                
-                # Remove existing depots and manifests for this AppID
-                logger.debug(f"Removing existing depots and manifests for AppID {app_id}")
-                cursor.execute('DELETE FROM depots WHERE app_id = ?', (app_id,))
-                cursor.execute('DELETE FROM manifests WHERE app_id = ?', (app_id,))
-                
-                # Insert new depots
-                depot_count = 0
-                for depot in depots:
-                    depot_id = depot.get('depot_id')
-                    decryption_key = depot.get('depot_key')  # Can be None
-                    depot_name = depot.get('depot_name', 'No Name')  # Default to 'No Name'
-                    
-                    if depot_id:
-                        cursor.execute('''
-                            INSERT OR REPLACE INTO depots (depot_id, app_id, decryption_key, depot_name)
-                            VALUES (?, ?, ?, ?)
-                        ''', (depot_id, app_id, decryption_key, depot_name))
-                        depot_count += 1
-                        logger.debug(f"Added depot {depot_id} ({depot_name}) for AppID {app_id}")
-
-                # Insert new manifest files
-                manifest_count = 0
-                for filename in manifest_files:
-                    cursor.execute('''
+        try:
+            # Hold the write lock across the commit and the AppID set update so
+            # _close_connections cannot reset the set in between
+            with self._write_lock:
+                with self._session(write=True) as conn:
+                    cursor = conn.cursor()
+                
+                    # Insert or update the AppIDs in place. INSERT OR REPLACE would delete the
+                    # row first and cascade through depots and manifests for nothing.
+                    # achievements_generated is reset as the old replace did.
+                    logger.debug(f"Inserting/updating AppIDs {list(batch)} in database")
+                    cursor.executemany('''
+                        INSERT INTO appids (app_id, game_name, last_updated, is_installed)
+                        VALUES (?, ?, CURRENT_TIMESTAMP, 1)
+                        ON CONFLICT(app_id) DO UPDATE SET
+                            game_name = excluded.game_name,
+                            last_updated = CURRENT_TIMESTAMP,
+                            is_installed = 1,
+                            achievements_generated = 0
+                    ''', app_rows)
+                
+                    # Remove existing depots and manifests for these AppIDs
+                    cursor.executemany('DELETE FROM depots WHERE app_id = ?', app_id_rows)
+                    cursor.executemany('DELETE FROM manifests WHERE app_id = ?', app_id_rows)
+                
+                    # Insert new depots, preparing the statement once for all rows. A depot
+                    # listed twice is updated in place (last one wins) rather than replaced.
+                    cursor.executemany('''
+                        INSERT INTO depots (depot_id, app_id, decryption_key, depot_name)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT(depot_id, app_id) DO UPDATE SET
+                            decryption_key = excluded.decryption_key,
+                            depot_name = excluded.depot_name
+                    ''', depot_rows)
+                    logger.debug(f"Added depots {[(row[1], row[0]) for row in depot_rows]}")
+                
+                    # Insert new manifest files
+                    cursor.executemany('''
                         INSERT INTO manifests (app_id, filename)
                         VALUES (?, ?)
-                    ''', (app_id, filename))
-                    manifest_count += 1
-                    logger.debug(f"Added manifest file {filename} for AppID {app_id}")
-                
-                conn.commit()
-                logger.info(f"Successfully added AppID {app_id} with {depot_count} depots and {manifest_count} manifest files")
-                return True
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to add AppID {app_id} with depots: {e}")
-                logger.debug("Add AppID with depots exception:", exc_info=True)
-                return False
-            finally:
-                if 'conn' in locals():
-                    conn.close()
+                    ''', manifest_rows)
+                    logger.debug(f"Added manifest files {[row[1] for row in manifest_rows]}")
+                
+                existing_app_ids = self._existing_app_ids
+                if existing_app_ids is not None:
+                    existing_app_ids.update(batch)
+            self._invalidate_depot_cache(list(batch))
+            logger.info(f"Successfully added {len(batch)} AppID(s) {list(batch)} with {len(depot_rows)} depots and {len(manifest_rows)} manifest files")
+            
+            # Refresh planner statistics as the tables grow. PRAGMA optimize only
+            # re-analyzes tables whose row counts changed substantially, so this is
+            # a no-op for most adds.
+            self._optimize()
+            return True
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to add AppIDs {list(batch)} with depots: {e}")
+            logger.debug("Add AppIDs with depots exception:", exc_info=True)
+            return False
     
     def remove_appid(self, app_id: str) -> bool:
         """
@@ -290,26 +733,26 @@ class GameDatabaseManager:
             bool: True if successful, False otherwise
         """
         logger.info(f"Removing AppID {app_id} from database")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                # Remove the AppID (CASCADE will remove associated depots and manifests)
-                logger.debug(f"Executing DELETE for AppID {app_id}")
-                cursor.execute('DELETE FROM appids WHERE app_id = ?', (app_id,))
-                
-                conn.commit()
-                logger.info(f"Successfully removed AppID {app_id} from database")
-                return True
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to remove AppID {app_id}: {e}")
-                logger.debug("Remove AppID exception:", exc_info=True)
-                return False
-            finally:
-                if 'conn' in locals():
-                    conn.close()
+        try:
+            # Hold the write lock across the commit and the AppID set update so
+            # _close_connections cannot reset the set in between
+            with self._write_lock:
+                with self._session(write=True) as conn:
+                    # Remove the AppID (CASCADE will remove associated depots and manifests)
+                    logger.debug(f"Executing DELETE for AppID {app_id}")
+                    conn.execute('DELETE FROM appids WHERE app_id = ?', (app_id,))
+                
+                existing_app_ids = self._existing_app_ids
+                if existing_app_ids is not None:
+                    existing_app_ids.discard(app_id)
+            self._invalidate_depot_cache([app_id])
+            logger.info(f"Successfully removed AppID {app_id} from database")
+            return True
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to remove AppID {app_id}: {e}")
+            logger.debug("Remove AppID exception:", exc_info=True)
+            return False
     
     def mark_appid_uninstalled(self, app_id: str) -> bool:
         """
@@ -322,28 +765,21 @@ class GameDatabaseManager:
             bool: True if successful, False otherwise
         """
         logger.info(f"Marking AppID {app_id} as uninstalled")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
+        try:
+            with self._session(write=True) as conn:
                 logger.debug(f"Updating is_installed flag for AppID {app_id}")
-                cursor.execute('''
+                conn.execute('''
                     UPDATE appids SET is_installed = 0, last_updated = CURRENT_TIMESTAMP
                     WHERE app_id = ?
                 ''', (app_id,))
                 
-                conn.commit()
-                logger.info(f"Successfully marked AppID {app_id} as uninstalled")
-                return True
+            logger.info(f"Successfully marked AppID {app_id} as uninstalled")
+            return True
                 
-            except sqlite3.Error as e:
-                logger.error(f"Failed to mark AppID {app_id} as uninstalled: {e}")
-                logger.debug("Mark AppID uninstalled exception:", exc_info=True)
-                return False
-            finally:
-                if 'conn' in locals():
-                    conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to mark AppID {app_id} as uninstalled: {e}")
+            logger.debug("Mark AppID uninstalled exception:", exc_info=True)
+            return False
     
     def is_appid_exists(self, app_id: str) -> bool:
         """
@@ -356,23 +792,24 @@ class GameDatabaseManager:
             bool: True if exists, False otherwise
         """
         logger.debug(f"Checking if AppID {app_id} exists in database")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('SELECT 1 FROM appids WHERE app_id = ? LIMIT 1', (app_id,))
-                result = cursor.fetchone()
-                
-                conn.close()
-                exists = result is not None
-                logger.debug(f"AppID {app_id} exists: {exists}")
-                return exists
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to check AppID {app_id}: {e}")
-                logger.debug("Check AppID exists exception:", exc_info=True)
-                return False
+        try:
+            # Read the attribute once: _close_connections may reset it to None meanwhile
+            existing_app_ids = self._existing_app_ids
+            if existing_app_ids is None:
+                # Load under the write lock so no write can commit between the read and the assignment
+                with self._session() as conn:
+                    existing_app_ids = {row[0] for row in conn.execute('SELECT app_id FROM appids')}
+                    self._existing_app_ids = existing_app_ids
+                logger.debug(f"Cached {len(existing_app_ids)} AppIDs")
+                
+            exists = app_id in existing_app_ids
+            logger.debug(f"AppID {app_id} exists: {exists}")
+            return exists
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to check AppID {app_id}: {e}")
+            logger.debug("Check AppID exists exception:", exc_info=True)
+            return False
     
     def get_appid_depots(self, app_id: str) -> List[Dict[str, str]]:
         """
@@ -385,34 +822,40 @@ class GameDatabaseManager:
             List[Dict]: List of depot dictionaries with 'depot_id' and 'decryption_key'
         """
         logger.debug(f"Retrieving depots for AppID {app_id}")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT depot_id, decryption_key, depot_name FROM depots 
-                    WHERE app_id = ? 
+        # Hand out copies so callers cannot modify the cached rows
+        with self._depot_cache_lock:
+            cached = self._depot_cache.get(app_id)
+            generation = self._depot_cache_generation
+        if cached is not None:
+            logger.debug(f"Using cached depots for AppID {app_id}")
+            return [dict(depot) for depot in cached]
+        
+        try:
+            with self._read_conn() as conn:
+                cursor = conn.execute('''
+                    SELECT depot_id, decryption_key, depot_name FROM depots
+                    WHERE app_id = ?
                     ORDER BY depot_id
                 ''', (app_id,))
                 
-                results = cursor.fetchall()
-                conn.close()
-                
-                depots = []
-                for depot_id, decryption_key, depot_name in results:
-                    depot = {'depot_id': depot_id, 'depot_name': depot_name or 'No Name'}
-                    if decryption_key:
-                        depot['depot_key'] = decryption_key
-                    depots.append(depot)
-                
-                logger.debug(f"Retrieved {len(depots)} depots for AppID {app_id}")
-                return depots
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to get depots for AppID {app_id}: {e}")
-                logger.debug("Get AppID depots exception:", exc_info=True)
-                return []
+                # Build each dict in one literal instead of inserting depot_key afterwards
+                depots = [
+                    {'depot_id': depot_id, 'depot_name': depot_name or 'No Name', 'depot_key': decryption_key}
+                    if decryption_key else
+                    {'depot_id': depot_id, 'depot_name': depot_name or 'No Name'}
+                    for depot_id, decryption_key, depot_name in cursor
+                ]
+                
+            with self._depot_cache_lock:
+                if generation == self._depot_cache_generation:
+                    self._depot_cache[app_id] = [dict(depot) for depot in depots]
+            logger.debug(f"Retrieved {len(depots)} depots for AppID {app_id}")
+            return depots
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get depots for AppID {app_id}: {e}")
+            logger.debug("Get AppID depots exception:", exc_info=True)
+            return []
     
     def get_depot_info(self, app_id: str, depot_id: str) -> Optional[Dict[str, str]]:
         """
@@ -426,34 +869,28 @@ class GameDatabaseManager:
             Optional[Dict]: Depot dictionary with depot info or None if not found
         """
         logger.debug(f"Retrieving info for depot {depot_id} in AppID {app_id}")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT depot_id, decryption_key, depot_name FROM depots 
+        try:
+            with self._read_conn() as conn:
+                result = conn.execute('''
+                    SELECT depot_id, decryption_key, depot_name FROM depots
                     WHERE app_id = ? AND depot_id = ?
-                ''', (app_id, depot_id))
-                
-                result = cursor.fetchone()
-                conn.close()
-                
-                if result:
-                    depot_id_found, decryption_key, depot_name = result
-                    depot = {'depot_id': depot_id_found, 'depot_name': depot_name or 'No Name'}
-                    if decryption_key:
-                        depot['depot_key'] = decryption_key
-                    logger.debug(f"Found depot {depot_id} for AppID {app_id}")
-                    return depot
-                else:
-                    logger.debug(f"Depot {depot_id} not found for AppID {app_id}")
-                    return None
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to get depot {depot_id} info for AppID {app_id}: {e}")
-                logger.debug("Get depot info exception:", exc_info=True)
+                ''', (app_id, depot_id)).fetchone()
+                
+            if result:
+                depot_id_found, decryption_key, depot_name = result
+                depot = {'depot_id': depot_id_found, 'depot_name': depot_name or 'No Name'}
+                if decryption_key:
+                    depot['depot_key'] = decryption_key
+                logger.debug(f"Found depot {depot_id} for AppID {app_id}")
+                return depot
+            else:
+                logger.debug(f"Depot {depot_id} not found for AppID {app_id}")
                 return None
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get depot {depot_id} info for AppID {app_id}: {e}")
+            logger.debug("Get depot info exception:", exc_info=True)
+            return None
     
     def remove_depot_from_appid(self, app_id: str, depot_id: str) -> bool:
         """
@@ -467,38 +904,26 @@ class GameDatabaseManager:
             bool: True if successful, False otherwise
         """
         logger.info(f"Removing depot {depot_id} from AppID {app_id}")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                # First check if depot exists
-                cursor.execute('''
-                    SELECT COUNT(*) FROM depots 
-                    WHERE app_id = ? AND depot_id = ?
-                ''', (app_id, depot_id))
-                
-                if cursor.fetchone()[0] == 0:
-                    logger.warning(f"Depot {depot_id} not found for AppID {app_id}")
-                    conn.close()
-                    return False
-                
-                # Remove the depot
-                cursor.execute('''
-                    DELETE FROM depots 
+        try:
+            with self._session(write=True) as conn:
+                cursor = conn.execute('''
+                    DELETE FROM depots
                     WHERE app_id = ? AND depot_id = ?
                 ''', (app_id, depot_id))
+                removed = cursor.rowcount > 0
                 
-                conn.commit()
-                conn.close()
+            self._invalidate_depot_cache([app_id])
+            if not removed:
+                logger.warning(f"Depot {depot_id} not found for AppID {app_id}")
+                return False
                 
-                logger.info(f"Successfully removed depot {depot_id} from AppID {app_id}")
-                return True
+            logger.info(f"Successfully removed depot {depot_id} from AppID {app_id}")
+            return True
                 
-            except sqlite3.Error as e:
-                logger.error(f"Failed to remove depot {depot_id} from AppID {app_id}: {e}")
-                logger.debug("Remove depot exception:", exc_info=True)
-                return False
+        except sqlite3.Error as e:
+            logger.error(f"Failed to remove depot {depot_id} from AppID {app_id}: {e}")
+            logger.debug("Remove depot exception:", exc_info=True)
+            return False
     
     def get_manifests_for_appid(self, app_id: str) -> List[str]:
         """
@@ -511,23 +936,91 @@ class GameDatabaseManager:
             List[str]: A list of manifest filenames.
         """
         logger.debug(f"Retrieving manifest files for AppID {app_id}")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-
-                cursor.execute('SELECT filename FROM manifests WHERE app_id = ?', (app_id,))
-                results = cursor.fetchall()
+        try:
+            with self._read_conn() as conn:
+                cursor = conn.execute('SELECT filename FROM manifests WHERE app_id = ?', (app_id,))
+                manifest_files = [row[0] for row in cursor]
 
-                conn.close()
-                manifest_files = [row[0] for row in results]
-                logger.debug(f"Retrieved {len(manifest_files)} manifest files for AppID {app_id}")
-                return manifest_files
+            logger.debug(f"Retrieved {len(manifest_files)} manifest files for AppID {app_id}")
+            return manifest_files
 
-            except sqlite3.Error as e:
-                logger.error(f"Failed to get manifest files for AppID {app_id}: {e}")
-                logger.debug("Get manifests for AppID exception:", exc_info=True)
-                return []
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get manifest files for AppID {app_id}: {e}")
+            logger.debug("Get manifests for AppID exception:", exc_info=True)
+            return []
+    
+    def get_manifests_for_appids(self, app_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        Get manifest filenames for several AppIDs in as few queries as possible.
+        
+        Args:
+            app_ids (List[str]): The Steam AppIDs to look up.
+            
+        Returns:
+            Dict[str, List[str]]: Mapping of AppID to its manifest filenames.
+            AppIDs without manifests map to an empty list.
+        """
+        logger.debug(f"Retrieving manifest files for {len(app_ids)} AppIDs")
+        manifests = defaultdict(list)
+        if not app_ids:
+            return {}
+        
+        try:
+            with self._read_conn() as conn:
+                for start in range(0, len(app_ids), MAX_QUERY_VARIABLES):
+                    chunk = app_ids[start:start + MAX_QUERY_VARIABLES]
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor = conn.execute(f'SELECT app_id, filename FROM manifests WHERE app_id IN ({placeholders})', chunk)
+                    for app_id, filename in cursor:
+                        manifests[app_id].append(filename)
+                
+            logger.debug(f"Retrieved manifest files for {len(manifests)} of {len(app_ids)} AppIDs")
+            return {app_id: manifests.get(app_id, []) for app_id in app_ids}
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get manifest files for AppIDs: {e}")
+            logger.debug("Get manifests for AppIDs exception:", exc_info=True)
+            return {app_id: [] for app_id in app_ids}
+    
+    def get_depots_for_appids(self, app_ids: List[str]) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Get depots for several AppIDs in as few queries as possible.
+        
+        Args:
+            app_ids (List[str]): The Steam AppIDs to look up.
+            
+        Returns:
+            Dict[str, List[Dict]]: Mapping of AppID to depot dictionaries in the
+            same format as get_appid_depots. AppIDs without depots map to an empty list.
+        """
+        logger.debug(f"Retrieving depots for {len(app_ids)} AppIDs")
+        depots = defaultdict(list)
+        if not app_ids:
+            return {}
+        
+        try:
+            with self._read_conn() as conn:
+                for start in range(0, len(app_ids), MAX_QUERY_VARIABLES):
+                    chunk = app_ids[start:start + MAX_QUERY_VARIABLES]
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor = conn.execute(f'''
+                        SELECT app_id, depot_id, decryption_key, depot_name FROM depots
+                        WHERE app_id IN ({placeholders})
+                        ORDER BY app_id, depot_id
+                    ''', chunk)
+                    for app_id, depot_id, decryption_key, depot_name in cursor:
+                        depot = {'depot_id': depot_id, 'depot_name': depot_name or 'No Name'}
+                        if decryption_key:
+                            depot['depot_key'] = decryption_key
+                        depots[app_id].append(depot)
+                
+            logger.debug(f"Retrieved depots for {len(depots)} of {len(app_ids)} AppIDs")
+            return {app_id: depots.get(app_id, []) for app_id in app_ids}
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get depots for AppIDs: {e}")
+            logger.debug("Get depots for AppIDs exception:", exc_info=True)
+            return {app_id: [] for app_id in app_ids}
     
     def get_appids_without_achievements(self) -> List[str]:
         """
@@ -537,23 +1030,18 @@ class GameDatabaseManager:
             List[str]: List of AppIDs with achievements_generated = 0
         """
         logger.debug("Retrieving AppIDs without achievement schemas")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('SELECT app_id FROM appids WHERE achievements_generated = 0 ORDER BY app_id')
-                results = cursor.fetchall()
+        try:
+            with self._read_conn() as conn:
+                cursor = conn.execute('SELECT app_id FROM appids WHERE achievements_generated = 0 ORDER BY app_id')
+                appids = [row[0] for row in cursor]
                 
-                conn.close()
-                appids = [row[0] for row in results]
-                logger.info(f"Retrieved {len(appids)} AppIDs without achievement schemas")
-                return appids
+            logger.info(f"Retrieved {len(appids)} AppIDs without achievement schemas")
+            return appids
                 
-            except sqlite3.Error as e:
-                logger.error(f"Failed to get AppIDs without achievements: {e}")
-                logger.debug("Get AppIDs without achievements exception:", exc_info=True)
-                return []
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get AppIDs without achievements: {e}")
+            logger.debug("Get AppIDs without achievements exception:", exc_info=True)
+            return []
     
     def mark_achievements_generated(self, app_id: str) -> bool:
         """
@@ -566,28 +1054,21 @@ class GameDatabaseManager:
             bool: True if successful, False otherwise
         """
         logger.debug(f"Marking achievements as generated for AppID: {app_id}")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('UPDATE appids SET achievements_generated = 1 WHERE app_id = ?', (app_id,))
-                
-                if cursor.rowcount > 0:
-                    conn.commit()
-                    logger.info(f"Successfully marked achievements as generated for AppID: {app_id}")
-                    result = True
-                else:
-                    logger.warning(f"No AppID found to update: {app_id}")
-                    result = False
-                
-                conn.close()
-                return result
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to mark achievements as generated for AppID {app_id}: {e}")
-                logger.debug("Mark achievements generated exception:", exc_info=True)
-                return False
+        try:
+            with self._session(write=True) as conn:
+                cursor = conn.execute('UPDATE appids SET achievements_generated = 1 WHERE app_id = ?', (app_id,))
+                updated = cursor.rowcount > 0
+                
+            if updated:
+                logger.info(f"Successfully marked achievements as generated for AppID: {app_id}")
+            else:
+                logger.warning(f"No AppID found to update: {app_id}")
+            return updated
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to mark achievements as generated for AppID {app_id}: {e}")
+            logger.debug("Mark achievements generated exception:", exc_info=True)
+            return False
 
     def get_all_installed_appids(self) -> List[str]:
         """
@@ -597,23 +1078,69 @@ class GameDatabaseManager:
             List[str]: List of installed AppIDs
         """
         logger.debug("Retrieving all installed AppIDs")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
+        try:
+            with self._read_conn() as conn:
+                cursor = conn.execute('SELECT app_id FROM appids WHERE is_installed = 1 ORDER BY app_id')
+                appids = [row[0] for row in cursor]
                 
-                cursor.execute('SELECT app_id FROM appids WHERE is_installed = 1 ORDER BY app_id')
-                results = cursor.fetchall()
+            logger.info(f"Retrieved {len(appids)} installed AppIDs")
+            return appids
                 
-                conn.close()
-                appids = [row[0] for row in results]
-                logger.info(f"Retrieved {len(appids)} installed AppIDs")
-                return appids
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get installed AppIDs: {e}")
+            logger.debug("Get installed AppIDs exception:", exc_info=True)
+            return []
+    
+    def get_installed_with_depots(self) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Get all installed AppIDs together with their depots in a single query.
+        
+        Prefer this over get_all_installed_appids followed by a depot lookup per AppID.
+        
+        Returns:
+            Dict[str, List[Dict]]: Mapping of installed AppID (in AppID order) to depot
+            dictionaries in the same format as get_appid_depots.
+        """
+        logger.debug("Retrieving installed AppIDs with their depots")
+        try:
+            with self._read_conn() as conn:
+                cursor = conn.execute('''
+                    SELECT a.app_id,
+                           json_group_array(json_object(
+                               'depot_id', d.depot_id,
+                               'decryption_key', d.decryption_key,
+                               'depot_name', d.depot_name
+                           ))
+                    FROM appids a
+                    LEFT JOIN depots d ON d.app_id = a.app_id
+                    WHERE a.is_installed = 1
+                    GROUP BY a.app_id
+                    ORDER BY a.app_id
+                ''')
                 
-            except sqlite3.Error as e:
-                logger.error(f"Failed to get installed AppIDs: {e}")
-                logger.debug("Get installed AppIDs exception:", exc_info=True)
-                return []
+                # LEFT JOIN yields a single all-NULL entry for apps without depots.
+                # json_group_array has no defined element order, so sort by depot_id to
+                # match get_appid_depots.
+                installed = {
+                    app_id: [
+                        {'depot_id': row['depot_id'], 'depot_name': row['depot_name'] or 'No Name', 'depot_key': row['decryption_key']}
+                        if row['decryption_key'] else
+                        {'depot_id': row['depot_id'], 'depot_name': row['depot_name'] or 'No Name'}
+                        for row in sorted(
+                            (row for row in json.loads(depots_json) if row['depot_id'] is not None),
+                            key=lambda row: row['depot_id']
+                        )
+                    ]
+                    for app_id, depots_json in cursor
+                }
+                
+            logger.debug(f"Retrieved {len(installed)} installed AppIDs with depots")
+            return installed
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get installed AppIDs with depots: {e}")
+            logger.debug("Get installed with depots exception:", exc_info=True)
+            return {}
     
     def get_all_depots_for_installed_apps(self) -> List[Dict[str, str]]:
         """
@@ -623,36 +1150,31 @@ class GameDatabaseManager:
             List[Dict]: List of all depot dictionaries with 'depot_id', 'app_id', and optional 'decryption_key'
         """
         logger.debug("Retrieving all depots for installed apps")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT d.depot_id, d.app_id, d.decryption_key, d.depot_name 
+        try:
+            with self._read_conn() as conn:
+                cursor = conn.execute('''
+                    SELECT d.depot_id, d.app_id, d.decryption_key, d.depot_name
                     FROM depots d
                     JOIN appids a ON d.app_id = a.app_id
                     WHERE a.is_installed = 1
                     ORDER BY d.app_id, d.depot_id
                 ''')
                 
-                results = cursor.fetchall()
-                conn.close()
-                
-                depots = []
-                for depot_id, app_id, decryption_key, depot_name in results:
-                    depot = {'depot_id': depot_id, 'app_id': app_id, 'depot_name': depot_name or 'No Name'}
-                    if decryption_key:
-                        depot['decryption_key'] = decryption_key
-                    depots.append(depot)
-                
-                logger.debug(f"Retrieved {len(depots)} depots for installed apps")
-                return depots
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to get all depots: {e}")
-                logger.debug("Get all depots exception:", exc_info=True)
-                return []
+                # Build the dicts straight from the cursor, one literal per row
+                depots = [
+                    {'depot_id': depot_id, 'app_id': app_id, 'depot_name': depot_name or 'No Name', 'decryption_key': decryption_key}
+                    if decryption_key else
+                    {'depot_id': depot_id, 'app_id': app_id, 'depot_name': depot_name or 'No Name'}
+                    for depot_id, app_id, decryption_key, depot_name in cursor
+                ]
+                
+            logger.debug(f"Retrieved {len(depots)} depots for installed apps")
+            return depots
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get all depots: {e}")
+            logger.debug("Get all depots exception:", exc_info=True)
+            return []
     
     def get_depots_with_keys_for_installed_apps(self) -> List[Dict[str, str]]:
         """
@@ -662,31 +1184,27 @@ class GameDatabaseManager:
             List[Dict]: List of depot dictionaries with 'depot_id', 'app_id', and 'decryption_key'
         """
         logger.debug("Retrieving depots with keys for installed apps")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT d.depot_id, d.app_id, d.decryption_key, d.depot_name 
+        try:
+            with self._read_conn() as conn:
+                cursor = conn.execute('''
+                    SELECT d.depot_id, d.app_id, d.decryption_key, d.depot_name
                     FROM depots d
                     JOIN appids a ON d.app_id = a.app_id
                     WHERE a.is_installed = 1 AND d.decryption_key IS NOT NULL
                     ORDER BY d.app_id, d.depot_id
                 ''')
-                
-                results = cursor.fetchall()
-                conn.close()
-                
-                depots_with_keys = [{'depot_id': row[0], 'app_id': row[1], 'decryption_key': row[2], 'depot_name': row[3] or 'No Name'} 
-                        for row in results]
-                logger.debug(f"Retrieved {len(depots_with_keys)} depots with keys")
-                return depots_with_keys
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to get depots with keys: {e}")
-                logger.debug("Get depots with keys exception:", exc_info=True)
-                return []
+                depots_with_keys = [
+                    {'depot_id': depot_id, 'app_id': app_id, 'decryption_key': decryption_key, 'depot_name': depot_name or 'No Name'}
+                    for depot_id, app_id, decryption_key, depot_name in cursor
+                ]
+                
+            logger.debug(f"Retrieved {len(depots_with_keys)} depots with keys")
+            return depots_with_keys
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get depots with keys: {e}")
+            logger.debug("Get depots with keys exception:", exc_info=True)
+            return []
     
     def get_database_stats(self) -> Dict[str, int]:
         """
@@ -696,48 +1214,36 @@ class GameDatabaseManager:
             Dict[str, int]: Statistics including total_appids, installed_appids, total_depots, depots_with_keys, and total_manifests
         """
         logger.debug("Retrieving database statistics")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                # Get total AppIDs
-                cursor.execute('SELECT COUNT(*) FROM appids')
-                total_appids = cursor.fetchone()[0]
-                
-                # Get installed AppIDs
-                cursor.execute('SELECT COUNT(*) FROM appids WHERE is_installed = 1')
-                installed_appids = cursor.fetchone()[0]
-                
-                # Get total depots
-                cursor.execute('SELECT COUNT(*) FROM depots')
-                total_depots = cursor.fetchone()[0]
-                
-                # Get depots with keys
-                cursor.execute('SELECT COUNT(*) FROM depots WHERE decryption_key IS NOT NULL')
-                depots_with_keys = cursor.fetchone()[0]
-                
-                # Get total manifest files tracked
-                cursor.execute('SELECT COUNT(*) FROM manifests')
-                total_manifests = cursor.fetchone()[0]
-                
-                conn.close()
-                
-                stats = {
-                    'total_appids': total_appids,
-                    'installed_appids': installed_appids,
-                    'total_depots': total_depots,
-                    'depots_with_keys': depots_with_keys,
-                    'total_manifests': total_manifests
-                }
-                
-                logger.info(f"Database stats: {stats}")
-                return stats
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to get database stats: {e}")
-                logger.debug("Get database stats exception:", exc_info=True)
-                return {'total_appids': 0, 'installed_appids': 0, 'total_depots': 0, 'depots_with_keys': 0, 'total_manifests': 0}
+        try:
+            with self._read_conn() as conn:
+                # One pass over each table with conditional aggregates instead of five COUNT queries
+                (total_appids, installed_appids, total_depots,
+                 depots_with_keys, total_manifests) = conn.execute('''
+                    SELECT a.total, a.installed, d.total, d.with_keys,
+                           (SELECT COUNT(*) FROM manifests)
+                    FROM (SELECT COUNT(*) AS total,
+                                 COALESCE(SUM(is_installed = 1), 0) AS installed
+                          FROM appids) a,
+                         (SELECT COUNT(*) AS total,
+                                 COALESCE(SUM(decryption_key IS NOT NULL), 0) AS with_keys
+                          FROM depots) d
+                ''').fetchone()
+                
+            stats = {
+                'total_appids': total_appids,
+                'installed_appids': installed_appids,
+                'total_depots': total_depots,
+                'depots_with_keys': depots_with_keys,
+                'total_manifests': total_manifests
+            }
+                
+            logger.info(f"Database stats: {stats}")
+            return stats
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get database stats: {e}")
+            logger.debug("Get database stats exception:", exc_info=True)
+            return {'total_appids': 0, 'installed_appids': 0, 'total_depots': 0, 'depots_with_keys': 0, 'total_manifests': 0}
     
     def get_installed_games(self) -> List[Dict[str, str]]:
         """
@@ -747,35 +1253,29 @@ class GameDatabaseManager:
             List[Dict]: List of games with 'app_id' and 'game_name' keys
         """
         logger.debug("Retrieving installed games list")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT app_id, game_name 
-                    FROM appids 
-                    WHERE is_installed = 1 
+        try:
+            with self._read_conn() as conn:
+                cursor = conn.execute('''
+                    SELECT app_id, game_name
+                    FROM appids
+                    WHERE is_installed = 1
                     ORDER BY game_name ASC, app_id ASC
                 ''')
                 
-                results = cursor.fetchall()
-                conn.close()
-                
                 games = []
-                for app_id, game_name in results:
+                for app_id, game_name in cursor:
                     games.append({
                         'app_id': app_id,
                         'game_name': game_name if game_name else f"AppID {app_id}"
                     })
                 
-                logger.debug(f"Retrieved {len(games)} installed games")
-                return games
+            logger.debug(f"Retrieved {len(games)} installed games")
+            return games
                 
-            except sqlite3.Error as e:
-                logger.error(f"Failed to get installed games: {e}")
-                logger.debug("Get installed games exception:", exc_info=True)
-                return []
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get installed games: {e}")
+            logger.debug("Get installed games exception:", exc_info=True)
+            return []
     
     def update_game_name(self, app_id: str, game_name: str) -> bool:
         """
@@ -789,27 +1289,20 @@ class GameDatabaseManager:
             bool: True if successful, False otherwise
         """
         logger.info(f"Updating game name for AppID {app_id}: {game_name}")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('''
+        try:
+            with self._session(write=True) as conn:
+                conn.execute('''
                     UPDATE appids SET game_name = ?, last_updated = CURRENT_TIMESTAMP
                     WHERE app_id = ?
                 ''', (game_name, app_id))
                 
-                conn.commit()
-                logger.info(f"Successfully updated game name for AppID {app_id}")
-                return True
+            logger.info(f"Successfully updated game name for AppID {app_id}")
+            return True
                 
-            except sqlite3.Error as e:
-                logger.error(f"Failed to update game name for AppID {app_id}: {e}")
-                logger.debug("Update game name exception:", exc_info=True)
-                return False
-            finally:
-                if 'conn' in locals():
-                    conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to update game name for AppID {app_id}: {e}")
+            logger.debug("Update game name exception:", exc_info=True)
+            return False
     
     def update_missing_game_names(self) -> int:
         """
@@ -822,39 +1315,61 @@ class GameDatabaseManager:
         logger.info("Starting update of missing game names")
         from steam_game_search import get_game_name_by_appid
         
-        updated_count = 0
-        with self._lock:
+        def lookup(app_id: str) -> Optional[str]:
             try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                # Get all AppIDs without game names
-                cursor.execute('SELECT app_id FROM appids WHERE game_name IS NULL OR game_name = ""')
-                app_ids = [row[0] for row in cursor.fetchall()]
-                
-                logger.info(f"Found {len(app_ids)} AppIDs without game names")
-                
-                for app_id in app_ids:
-                    try:
-                        logger.debug(f"Looking up game name for AppID {app_id}")
-                        game_name = get_game_name_by_appid(app_id)
-                        if game_name and game_name != f"AppID {app_id}":
-                            cursor.execute('''
-                                UPDATE appids SET game_name = ?, last_updated = CURRENT_TIMESTAMP
-                                WHERE app_id = ?
-                            ''', (game_name, app_id))
-                            updated_count += 1
-                            logger.info(f"Updated game name for AppID {app_id}: {game_name}")
-                    except Exception as e:
-                        logger.warning(f"Failed to update game name for AppID {app_id}: {e}")
-                
-                conn.commit()
-                conn.close()
-                logger.info(f"Completed update of missing game names: {updated_count} updated")
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to update missing game names: {e}")
-                logger.debug("Update missing game names exception:", exc_info=True)
+                logger.debug(f"Looking up game name for AppID {app_id}")
+                game_name = get_game_name_by_appid(app_id)
+                if game_name and game_name != f"AppID {app_id}":
+                    logger.info(f"Found game name for AppID {app_id}: {game_name}")
+                    return game_name
+            except Exception as e:
+                logger.warning(f"Failed to update game name for AppID {app_id}: {e}")
+            return None
+        
+        updated_count = 0
+        try:
+            # Get all AppIDs without game names
+            with self._read_conn() as conn:
+                app_ids = [row[0] for row in conn.execute('SELECT app_id FROM appids WHERE game_name IS NULL OR game_name = ""')]
+                
+            logger.info(f"Found {len(app_ids)} AppIDs without game names")
+                
+            # Write names in batches so progress is committed periodically
+            # and the WAL does not grow for the whole run
+            batch_size = 100
+            pending = []
+            update_sql = '''
+                UPDATE appids SET game_name = ?, last_updated = CURRENT_TIMESTAMP
+                WHERE app_id = ?
+            '''
+                
+            # The lookups are network-bound, so run them concurrently; results are
+            # written from this thread through the single writer connection
+            with ThreadPoolExecutor(max_workers=NAME_LOOKUP_WORKERS) as executor:
+                for app_id, game_name in zip(app_ids, executor.map(lookup, app_ids)):
+                    if game_name:
+                        pending.append((game_name, app_id))
+                
+                    if len(pending) >= batch_size:
+                        with self._session(write=True) as conn:
+                            conn.executemany(update_sql, pending)
+                        updated_count += len(pending)
+                        pending.clear()
+                    
+            if pending:
+                with self._session(write=True) as conn:
+                    conn.executemany(update_sql, pending)
+                updated_count += len(pending)
+                
+            # Truncate the WAL after the write session
+            with self._session() as conn:
+                conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            self._optimize()
+            logger.info(f"Completed update of missing game names: {updated_count} updated")
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to update missing game names: {e}")
+            logger.debug("Update missing game names exception:", exc_info=True)
         
         return updated_count
     
@@ -870,39 +1385,142 @@ class GameDatabaseManager:
             bool: True if successful, False otherwise
         """
         logger.debug(f"Updating name for depot {depot_id} to '{depot_name}'")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('''
+        try:
+            with self._session(write=True) as conn:
+                cursor = conn.execute('''
                     UPDATE depots SET depot_name = ?
                     WHERE depot_id = ?
                 ''', (depot_name, depot_id))
-                
-                if cursor.rowcount > 0:
-                    conn.commit()
-                    conn.close()
-                    logger.info(f"Successfully updated depot {depot_id} name to '{depot_name}'")
-                    return True
-                else:
-                    conn.close()
-                    logger.warning(f"No depot found with ID {depot_id} to update")
-                    return False
-                
-            except sqlite3.Error as e:
-                logger.error(f"Failed to update depot {depot_id} name: {e}")
-                logger.debug("Update depot name exception:", exc_info=True)
-                return False
-            finally:
-                if 'conn' in locals():
-                    conn.close()
+                updated = cursor.rowcount > 0
+                
+            # The same depot ID can belong to several AppIDs
+            self._invalidate_depot_cache()
+            if updated:
+                logger.info(f"Successfully updated depot {depot_id} name to '{depot_name}'")
+            else:
+                logger.warning(f"No depot found with ID {depot_id} to update")
+            return updated
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to update depot {depot_id} name: {e}")
+            logger.debug("Update depot name exception:", exc_info=True)
+            return False
 
+    def verify_integrity(self, full: bool = True) -> bool:
+        """
+        Check the database for corruption and rebuild it if the check fails.
+        
+        A full PRAGMA integrity_check also cross-checks every index against its table,
+        so it is meant for explicit maintenance. Startup uses the cheaper quick_check,
+        which still reads every page but skips the index verification.
+        
+        Args:
+            full (bool): Run integrity_check instead of quick_check.
+        
+        Returns:
+            bool: True if the database passed the check, False if it was rebuilt
+        """
+        check = 'integrity_check' if full else 'quick_check'
+        logger.debug(f"Verifying database integrity ({check})")
+        try:
+            with self._session() as conn:
+                integrity_result = conn.execute(f'PRAGMA {check}').fetchone()[0]
+        except sqlite3.DatabaseError as e:
+            # Badly damaged files can fail the check outright instead of reporting errors
+            integrity_result = str(e)
+        
+        if integrity_result != 'ok':
+            logger.warning(f"Database corruption detected: {integrity_result}")
+            self._handle_database_corruption()
+            return False
+        
+        logger.debug("Database integrity check passed")
+        return True
+    
     def close(self):
-        """Close the database connection."""
+        """
+        Refresh query planner statistics and close all cached connections.
+        
+        Registered with atexit, so it runs automatically when the application exits.
+        Must also be called before deleting the database file. Later calls reopen
+        connections as needed, which also restarts the periodic optimize timer.
+        """
         logger.debug("Database manager close() called")
-        # SQLite connections are created per operation, so no persistent connection to close
-        pass
+        # Held throughout so a timer tick waiting on the lock finds itself cancelled
+        # and cannot reopen (or recreate) the database file once it is closed
+        with self._write_lock:
+            self._closing = True
+            try:
+                if self._optimize_timer is not None:
+                    self._optimize_timer.cancel()
+                    self._optimize_timer = None
+                self._optimize()
+                self.maintenance()
+                self._close_connections()
+            finally:
+                self._closing = False
+        logger.debug("Database connections closed")
+    
+    def _optimize(self):
+        """
+        Run PRAGMA optimize on the writer connection.
+        
+        Pooled readers are read-only and cannot write the statistics tables, so
+        only the writer is optimized.
+        """
+        # Skip optimizing if the database was already removed (e.g. by a full cleanup)
+        if not self.db_path.exists():
+            return
+        
+        try:
+            with self._session() as conn:
+                conn.execute('PRAGMA analysis_limit=400')
+                conn.execute('PRAGMA optimize')
+            logger.debug("Database statistics optimized")
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to optimize database: {e}")
+            logger.debug("Database optimize exception:", exc_info=True)
+    
+    def maintenance(self):
+        """
+        Truncate the WAL and return up to 1000 free pages to the filesystem.
+        
+        Runs on close() and alongside the periodic optimize, so on-disk size stays
+        bounded after repeated installs and removals.
+        """
+        if not self.db_path.exists():
+            return
+        
+        try:
+            with self._session() as conn:
+                conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                # incremental_vacuum frees one page per step and execute() only steps once;
+                # executescript runs it to completion
+                conn.executescript('PRAGMA incremental_vacuum(1000);')
+            logger.debug("Database maintenance completed")
+        except sqlite3.Error as e:
+            logger.warning(f"Database maintenance failed: {e}")
+            logger.debug("Database maintenance exception:", exc_info=True)
+    
+    def _schedule_optimize(self):
+        """
+        Re-run PRAGMA optimize and maintenance every OPTIMIZE_INTERVAL seconds on a daemon timer.
+        
+        Callers must hold _write_lock. The timer stops once close() cancels it.
+        """
+        def run():
+            with self._write_lock:
+                # close() cancelled this timer while it waited for the lock
+                if self._optimize_timer is not timer:
+                    return
+                self._optimize()
+                self.maintenance()
+                self._schedule_optimize()
+        
+        timer = threading.Timer(OPTIMIZE_INTERVAL, run)
+        timer.daemon = True
+        self._optimize_timer = timer
+        timer.start()
 
     # =============================================================================
     # --- STEAM ID MANAGEMENT ---
@@ -916,26 +1534,21 @@ class GameDatabaseManager:
             str or None: The Steam ID if stored, None otherwise
         """
         logger.debug("Getting Steam ID from database")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('SELECT steam_id FROM user_data WHERE id = 1')
-                result = cursor.fetchone()
-                conn.close()
-                
-                if result and result[0]:
-                    logger.debug(f"Found Steam ID: {result[0]}")
-                    return result[0]
-                else:
-                    logger.debug("No Steam ID found in database")
-                    return None
-                    
-            except sqlite3.Error as e:
-                logger.error(f"Failed to get Steam ID: {e}")
-                logger.debug("Get Steam ID exception:", exc_info=True)
+        try:
+            with self._read_conn() as conn:
+                result = conn.execute('SELECT steam_id FROM user_data WHERE id = 1').fetchone()
+                
+            if result and result[0]:
+                logger.debug(f"Found Steam ID: {result[0]}")
+                return result[0]
+            else:
+                logger.debug("No Steam ID found in database")
                 return None
+                
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get Steam ID: {e}")
+            logger.debug("Get Steam ID exception:", exc_info=True)
+            return None
 
     def set_steam_id(self, steam_id: str) -> bool:
         """
@@ -948,38 +1561,43 @@ class GameDatabaseManager:
             bool: True if successful, False otherwise
         """
         logger.info(f"Storing Steam ID: {steam_id}")
-        with self._lock:
-            try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('''
+        try:
+            with self._session(write=True) as conn:
+                conn.execute('''
                     INSERT OR REPLACE INTO user_data (id, steam_id, last_updated)
                     VALUES (1, ?, CURRENT_TIMESTAMP)
                 ''', (steam_id,))
                 
-                conn.commit()
-                conn.close()
-                logger.info(f"Successfully stored Steam ID: {steam_id}")
-                return True
+            logger.info(f"Successfully stored Steam ID: {steam_id}")
+            return True
                 
-            except sqlite3.Error as e:
-                logger.error(f"Failed to store Steam ID: {e}")
-                logger.debug("Set Steam ID exception:", exc_info=True)
-                return False
+        except sqlite3.Error as e:
+            logger.error(f"Failed to store Steam ID: {e}")
+            logger.debug("Set Steam ID exception:", exc_info=True)
+            return False
 
 
 # =============================================================================
 # --- CONVENIENCE FUNCTIONS ---
 # =============================================================================
 
+_instance: Optional[GameDatabaseManager] = None
+_instance_lock = threading.Lock()
+
+
 def get_database_manager() -> GameDatabaseManager:
     """
     Get a singleton instance of the database manager.
     
+    Construction is guarded by a lock so threads racing at startup share one
+    instance instead of each running _init_database on the same file.
+    
     Returns:
         GameDatabaseManager: The database manager instance
     """
-    if not hasattr(get_database_manager, '_instance'):
-        get_database_manager._instance = GameDatabaseManager()
-    return get_database_manager._instance
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = GameDatabaseManager()
+    return _instance
@@ -4,14 +4,423 @@
 # Handles copying manifest files from data folders to Steam's depot cache
 # and removing them during uninstallation.
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
-from pathlib import Path
+import os
 import shutil
-from typing import Dict, List, Optional
+import stat
+import threading
+from typing import Dict, Iterator, List, Optional
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Concurrent copies in copy_manifest_files. Each copy is a short I/O-bound
+# call, so a few threads overlap the per-file open/close latency.
+MANIFEST_COPY_WORKERS = 8
+
+# os.copy_file_range exists on Linux only (Python 3.8+); resolved once here
+# rather than per copied file.
+_HAS_COPY_FILE_RANGE = hasattr(os, 'copy_file_range')
+
+# Matched with str.endswith on the lowercased name; Path.glob would build and
+# compile a pattern on every call.
+_MANIFEST_SUFFIX = '.manifest'
+
+# _link_or_copy writes to "<destination>.<pid>.<thread id>.tmp" before moving the
+# file into place
+_TEMP_SUFFIX = '.tmp'
+
+
+def _is_manifest(entry: os.DirEntry) -> bool:
+    """
+    Check whether a directory entry is a .manifest file.
+    
+    Args:
+        entry (os.DirEntry): Entry from os.scandir
+        
+    Returns:
+        bool: True for regular files with a .manifest suffix (any case)
+    """
+    return entry.name.lower().endswith(_MANIFEST_SUFFIX) and entry.is_file()
+
+
+def _iter_manifests(directory: str) -> Iterator[os.DirEntry]:
+    """
+    Yield the .manifest files in a directory as it is read.
+    
+    Uses os.scandir rather than Path.glob so the entries carry the file type and,
+    on Windows, the size and timestamps from the directory listing itself, saving
+    a stat call per file. Entries are yielded while the listing is read, so callers
+    that only fold over them never hold the whole folder in memory.
+    
+    Args:
+        directory (str): Directory to scan
+        
+    Yields:
+        os.DirEntry: Entries for the manifest files, none if the directory is missing
+    """
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if _is_manifest(entry):
+                yield entry
+
+
+def _list_temp_leftovers(directory: str) -> List[str]:
+    """
+    List temporary files that _link_or_copy left behind in other processes.
+    
+    Only names of the form <manifest>.<pid>.<thread id>.tmp are matched, so other
+    .tmp files in Steam's folder are left alone. Files from this process are skipped
+    because they may belong to a copy still in progress on another thread.
+    
+    Args:
+        directory (str): Directory to scan
+    
+    Returns:
+        List[str]: Leftover filenames, empty if the directory is missing
+    """
+    leftovers = []
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return leftovers
+    own_pid = str(os.getpid())
+    with entries:
+        for entry in entries:
+            if not entry.name.endswith(_TEMP_SUFFIX):
+                continue
+            parts = entry.name[:-len(_TEMP_SUFFIX)].rsplit('.', 2)
+            if (len(parts) == 3 and parts[0].lower().endswith(_MANIFEST_SUFFIX)
+                    and parts[1].isdigit() and parts[2].isdigit()
+                    and parts[1] != own_pid and entry.is_file()):
+                leftovers.append(entry.name)
+    return leftovers
+
+
+def list_manifest_filenames(directory: str) -> List[str]:
+    """
+    List the names of the .manifest files in a directory.
+    
+    Args:
+        directory (str): Directory to scan
+        
+    Returns:
+        List[str]: Manifest filenames, empty if the directory is missing
+    """
+    return [entry.name for entry in _iter_manifests(directory)]
+
+
+def has_manifests(directory: str) -> Optional[bool]:
+    """
+    Check whether a directory holds any .manifest file, stopping at the first one.
+    
+    Args:
+        directory (str): Directory to scan
+    
+    Returns:
+        Optional[bool]: Whether a manifest was found, or None if the directory is missing
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return any(_is_manifest(entry) for entry in entries)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _files_equal(first: str, second: str, bufsize: int = 1 << 20) -> bool:
+    """
+    Compare two files of equal size byte for byte.
+    
+    Reads both in blocks into preallocated buffers and stops at the first block
+    that differs, so a mismatch near the start costs little.
+    
+    Args:
+        first (str): Path of the first file
+        second (str): Path of the second file
+        bufsize (int): Block size to read at a time
+        
+    Returns:
+        bool: True if the contents are identical
+    """
+    first_buffer = bytearray(bufsize)
+    second_buffer = bytearray(bufsize)
+    with open(first, 'rb', buffering=0) as first_file, open(second, 'rb', buffering=0) as second_file:
+        while True:
+            first_read = first_file.readinto(first_buffer)
+            second_read = second_file.readinto(second_buffer)
+            if first_read != second_read:
+                return False
+            if not first_read:
+                return True
+            if first_read == bufsize:
+                if first_buffer != second_buffer:
+                    return False
+            elif first_buffer[:first_read] != second_buffer[:second_read]:
+                return False
+
+
+def _copy_in_kernel(source: str, destination: str):
+    """
+    Copy a file with os.copy_file_range, keeping its timestamps like shutil.copy2.
+    
+    The kernel copies the data without passing it through user space, and
+    reflink-capable filesystems (btrfs, XFS) or NFS can clone or copy it on the
+    server without moving it at all. Raises OSError where the kernel or filesystem
+    cannot do this (e.g. EXDEV across filesystems before Linux 5.3).
+    
+    Args:
+        source (str): Path of the manifest file to copy
+        destination (str): Path of the new file to create
+    """
+    source_fd = os.open(source, os.O_RDONLY)
+    try:
+        source_stat = os.fstat(source_fd)
+        destination_fd = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                                 stat.S_IMODE(source_stat.st_mode))
+        try:
+            remaining = source_stat.st_size
+            while remaining > 0:
+                copied = os.copy_file_range(source_fd, destination_fd, remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+            if remaining:
+                # The source came up short (e.g. truncated while copying); leave the
+                # partial file unstamped so the caller falls back to a normal copy
+                raise OSError(f"copy_file_range stopped with {remaining} bytes left to copy")
+            # The skip check compares modification times, so carry them over as
+            # copy2 does, but through the open descriptor and the stat already
+            # taken rather than a copystat pass that reopens both paths
+            os.utime(destination_fd, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        finally:
+            os.close(destination_fd)
+    finally:
+        os.close(source_fd)
+
+
+def _link_or_copy(source: str, destination: str):
+    """
+    Hard-link source to destination, falling back to a copy.
+    
+    A hard link moves no data when both paths are on the same volume. os.link raises
+    when they are not or when the filesystem has no hard links (e.g. FAT32), and the
+    file is then copied instead, in the kernel where _copy_in_kernel can, otherwise
+    with shutil.copy2.
+    
+    The link or copy is made under a temporary name in the target folder and moved
+    over the destination with os.replace. An existing destination may itself be a
+    hard link to a data folder file from an earlier install, so writing into it in
+    place would change every path sharing that file; replacing it only drops the
+    old link. Removing the depot cache entry later likewise never touches the source.
+    
+    Args:
+        source (str): Path of the manifest file to copy
+        destination (str): Path to create in the depot cache
+    """
+    temp_path = f"{destination}.{os.getpid()}.{threading.get_ident()}{_TEMP_SUFFIX}"
+    replaced = False
+    try:
+        # A leftover from an interrupted run could be a link to some other file
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            copied = False
+            if _HAS_COPY_FILE_RANGE:
+                try:
+                    _copy_in_kernel(source, temp_path)
+                    copied = True
+                except OSError as e:
+                    logger.debug("In-kernel copy of %s failed, copying normally: %s", source, e)
+            if not copied:
+                shutil.copy2(source, temp_path)
+        
+        os.replace(temp_path, destination)
+        replaced = True
+    finally:
+        # Never leave the temporary file in Steam's folder; remove_manifest_files
+        # sweeps up any that a killed process could not remove here
+        if not replaced:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+
+def copy_manifest_files(data_folder: str, target_dir: str) -> Dict[str, List[str]]:
+    """
+    Place every manifest file from a data folder into a depot cache folder.
+    
+    Shared by copy_manifests_for_appid and steamtools, which fill different depot
+    cache folders. Files already up to date are skipped; the rest are hard-linked or
+    copied concurrently.
+    
+    Args:
+        data_folder (str): Path to folder containing manifest files
+        target_dir (str): Existing folder to place them in
+    
+    Returns:
+        Dict[str, List[str]]: 'copied' and 'skipped' filenames, and 'failed' messages
+    """
+    outcome = {'copied': [], 'skipped': [], 'failed': []}
+    
+    # Decide which manifest files need copying. Destinations are built as plain
+    # strings; a Path per file would only be converted back for the syscalls.
+    target_dir = os.fspath(target_dir)
+    
+    # Snapshot the depot cache with one directory listing instead of a stat per
+    # manifest. Only entries that share a name with a source manifest are ever
+    # stat'ed, and on Windows their size and mtime come with the listing itself.
+    # The snapshot lives for this call only: Steam writes to the same folder, so
+    # a longer-lived index could go stale between installs.
+    try:
+        with os.scandir(target_dir) as entries:
+            existing = {entry.name: entry for entry in entries}
+    except FileNotFoundError:
+        existing = {}
+    
+    pending = []
+    for manifest_file in _iter_manifests(data_folder):
+        try:
+            destination = os.path.join(target_dir, manifest_file.name)
+            logger.debug("Processing manifest file: %s", manifest_file.name)
+            
+            # Skip files already copied: a hard link shares the source's metadata and copy2
+            # preserves its modification time, so a destination with the same size and
+            # mtime is the file we placed there last time.
+            # Size alone would miss a source that was replaced by a same-sized file.
+            existing_entry = existing.get(manifest_file.name)
+            if existing_entry is not None:
+                dest_stat = existing_entry.stat()
+                source_stat = manifest_file.stat()
+                if source_stat.st_size == dest_stat.st_size:
+                    if source_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+                        outcome['skipped'].append(manifest_file.name)
+                        logger.debug("Skipping manifest %s (already exists with same size and modification time)", manifest_file.name)
+                        continue
+                    # Same size but a different mtime, e.g. placed by Steam itself:
+                    # comparing the contents avoids rewriting an identical file
+                    if _files_equal(manifest_file.path, destination):
+                        outcome['skipped'].append(manifest_file.name)
+                        logger.debug("Skipping manifest %s (already exists with identical contents)", manifest_file.name)
+                        continue
+            
+            pending.append((manifest_file, destination))
+        
+        except Exception as e:
+            logger.error("Failed to copy manifest %s: %s", manifest_file.name, e)
+            logger.debug("Manifest copy exception for %s:", manifest_file.name, exc_info=True)
+            outcome['failed'].append(f"Failed to copy manifest file {manifest_file.name}: {e}")
+    
+    # Copy the files concurrently; the copies are independent and I/O-bound
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(MANIFEST_COPY_WORKERS, len(pending))) as executor:
+            futures = {}
+            for manifest_file, destination in pending:
+                logger.debug("Copying %s to %s", manifest_file.name, target_dir)
+                futures[executor.submit(_link_or_copy, manifest_file.path, destination)] = manifest_file
+            
+            for future in as_completed(futures):
+                manifest_file = futures[future]
+                try:
+                    future.result()
+                    outcome['copied'].append(manifest_file.name)
+                except Exception as e:
+                    logger.error("Failed to copy manifest %s: %s", manifest_file.name, e)
+                    logger.debug("Manifest copy exception for %s:", manifest_file.name, exc_info=True)
+                    outcome['failed'].append(f"Failed to copy manifest file {manifest_file.name}: {e}")
+    
+    # One summary line instead of a log record per copied file
+    if outcome['copied'] and logger.isEnabledFor(logging.INFO):
+        logger.info("Copied %s manifest(s): %s", len(outcome['copied']), ', '.join(outcome['copied']))
+    
+    return outcome
+
+
+def remove_manifest_files(target_dir: str, manifest_filenames: Optional[List[str]] = None) -> Dict[str, List[str]]:
+    """
+    Remove manifest files from a depot cache folder.
+    
+    Shared by the depot cache and steamtools removal functions, which clean
+    different depot cache folders. Temporary files left by an interrupted copy
+    are removed as well.
+    
+    Args:
+        target_dir (str): Depot cache folder to remove files from
+        manifest_filenames (List[str]): Filenames to remove, or None for every
+            .manifest file in the folder
+    
+    Returns:
+        Dict[str, List[str]]: 'removed' and 'missing' filenames, and 'failed' messages
+    """
+    outcome = {'removed': [], 'missing': [], 'failed': []}
+    
+    target_dir = os.fspath(target_dir)
+    if manifest_filenames is None:
+        manifest_filenames = list_manifest_filenames(target_dir)
+    else:
+        # Callers can name the same manifest more than once; unlink each only once
+        manifest_filenames = list(dict.fromkeys(manifest_filenames))
+    
+    # Where the platform supports it (not Windows), unlink relative to an open
+    # directory descriptor so the folder path is not resolved again per file
+    dir_fd = None
+    if os.unlink in os.supports_dir_fd:
+        try:
+            dir_fd = os.open(target_dir, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+        except FileNotFoundError:
+            logger.info("Depot cache directory does not exist: %s", target_dir)
+            outcome['missing'].extend(manifest_filenames)
+            return outcome
+        except OSError as e:
+            logger.debug("Could not open %s for relative unlinks: %s", target_dir, e)
+    
+    try:
+        for filename in manifest_filenames:
+            # Unlink directly rather than checking exists() first, saving a stat call
+            try:
+                logger.debug("Removing manifest file: %s", filename)
+                if dir_fd is not None:
+                    os.unlink(filename, dir_fd=dir_fd)
+                else:
+                    os.unlink(os.path.join(target_dir, filename))
+                outcome['removed'].append(filename)
+            except FileNotFoundError:
+                outcome['missing'].append(filename)
+                logger.debug("Manifest file not found in %s: %s", target_dir, filename)
+            except Exception as e:
+                logger.error("Failed to remove manifest %s: %s", filename, e)
+                logger.debug("Manifest removal exception for %s:", filename, exc_info=True)
+                outcome['failed'].append(f"Failed to remove manifest file {filename}: {e}")
+        
+        for filename in _list_temp_leftovers(target_dir):
+            try:
+                if dir_fd is not None:
+                    os.unlink(filename, dir_fd=dir_fd)
+                else:
+                    os.unlink(os.path.join(target_dir, filename))
+                logger.debug("Removed leftover temporary file: %s", filename)
+            except OSError as e:
+                logger.debug("Could not remove leftover temporary file %s: %s", filename, e)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    
+    # One summary line instead of a log record per removed file
+    if outcome['removed'] and logger.isEnabledFor(logging.INFO):
+        logger.info("Removed %s manifest(s): %s", len(outcome['removed']), ', '.join(outcome['removed']))
+    
+    return outcome
+
 
 def copy_manifests_for_appid(steam_path: str, app_id: str, data_folder: str) -> Dict[str, int]:
     """
@@ -25,68 +434,33 @@ def copy_manifests_for_appid(steam_path: str, app_id: str, data_folder: str) ->
     Returns:
         Dict[str, int]: Statistics with 'copied_count' and 'skipped_count'
     """
-    logger.info(f"Copying manifest files for AppID {app_id} from {data_folder}")
-    logger.debug(f"Steam path: {steam_path}")
+    logger.info("Copying manifest files for AppID %s from %s", app_id, data_folder)
+    logger.debug("Steam path: %s", steam_path)
     
     stats = {'copied_count': 0, 'skipped_count': 0}
     
     try:
-        # Convert to Path objects
-        steam_path_obj = Path(steam_path)
-        data_folder_obj = Path(data_folder)
-        
-        logger.debug(f"Data folder path: {data_folder_obj}")
-        
         # Construct depot cache path
-        depot_cache_path = steam_path_obj / 'depotcache'
-        logger.debug(f"Depot cache path: {depot_cache_path}")
-        
-        if not depot_cache_path.exists():
-            try:
-                logger.info(f"Creating depot cache directory: {depot_cache_path}")
-                depot_cache_path.mkdir(parents=True, exist_ok=True)
-                logger.info(f"Created depot cache directory successfully")
-            except Exception as e:
-                logger.error(f"Failed to create depot cache directory: {e}")
-                logger.debug("Depot cache creation exception:", exc_info=True)
-                return stats
-        
-        # Find all manifest files in the data folder
-        manifest_files = list(data_folder_obj.glob("*.manifest"))
-        logger.debug(f"Found {len(manifest_files)} manifest files in data folder")
+        depot_cache_path = os.path.join(steam_path, 'depotcache')
+        logger.debug("Depot cache path: %s", depot_cache_path)
         
-        if not manifest_files:
-            logger.info(f"No manifest files found for AppID {app_id} in {data_folder_obj}")
+        # makedirs with exist_ok already tolerates an existing directory, so there is no
+        # separate exists() check that another process could race
+        try:
+            os.makedirs(depot_cache_path, exist_ok=True)
+        except Exception as e:
+            logger.error("Failed to create depot cache directory: %s", e)
+            logger.debug("Depot cache creation exception:", exc_info=True)
             return stats
         
-        # Copy each manifest file
-        for manifest_file in manifest_files:
-            try:
-                destination = depot_cache_path / manifest_file.name
-                logger.debug(f"Processing manifest file: {manifest_file.name}")
-                
-                # Check if file already exists and is identical
-                if destination.exists():
-                    if manifest_file.stat().st_size == destination.stat().st_size:
-                        # Files are same size, assume they're identical
-                        stats['skipped_count'] += 1
-                        logger.debug(f"Skipping manifest {manifest_file.name} (already exists with same size)")
-                        continue
-                
-                # Copy the file
-                logger.debug(f"Copying {manifest_file.name} to depot cache")
-                shutil.copy2(manifest_file, destination)
-                stats['copied_count'] += 1
-                logger.info(f"Copied manifest: {manifest_file.name}")
-                
-            except Exception as e:
-                logger.error(f"Failed to copy manifest {manifest_file.name}: {e}")
-                logger.debug(f"Manifest copy exception for {manifest_file.name}:", exc_info=True)
+        outcome = copy_manifest_files(data_folder, depot_cache_path)
+        stats['copied_count'] = len(outcome['copied'])
+        stats['skipped_count'] = len(outcome['skipped'])
         
-        logger.info(f"Depot cache update complete for AppID {app_id}: {stats['copied_count']} copied, {stats['skipped_count']} skipped")
+        logger.info("Depot cache update complete for AppID %s: %s copied, %s skipped", app_id, stats['copied_count'], stats['skipped_count'])
         
     except Exception as e:
-        logger.error(f"Failed to update depot cache for AppID {app_id}: {e}")
+        logger.error("Failed to update depot cache for AppID %s: %s", app_id, e)
         logger.debug("Depot cache update exception:", exc_info=True)
     
     return stats
@@ -103,48 +477,30 @@ def remove_manifests_for_appid(steam_path: str, manifest_filenames: List[str]) -
     Returns:
         Dict[str, int]: Statistics with 'removed_count'.
     """
-    logger.info(f"Removing {len(manifest_filenames)} manifest files from depot cache")
-    logger.debug(f"Steam path: {steam_path}")
-    logger.debug(f"Manifest files to remove: {manifest_filenames}")
+    logger.info("Removing %s manifest files from depot cache", len(manifest_filenames))
+    logger.debug("Steam path: %s", steam_path)
+    logger.debug("Manifest files to remove: %s", manifest_filenames)
     
     stats = {'removed_count': 0}
     
     try:
-        steam_path_obj = Path(steam_path)
-        
         # Construct depot cache path
-        depot_cache_path = steam_path_obj / 'depotcache'
-        logger.debug(f"Depot cache path: {depot_cache_path}")
-        
-        if not depot_cache_path.exists():
-            logger.info(f"Depot cache directory does not exist: {depot_cache_path}")
-            return stats
+        depot_cache_path = os.path.join(steam_path, 'depotcache')
+        logger.debug("Depot cache path: %s", depot_cache_path)
         
         if not manifest_filenames:
             logger.info("No manifest files specified for removal")
             return stats
             
-        # Remove each specified manifest file
-        for filename in manifest_filenames:
-            manifest_file_path = depot_cache_path / filename
-            logger.debug(f"Processing manifest file for removal: {filename}")
-            
-            if manifest_file_path.exists():
-                try:
-                    logger.debug(f"Removing manifest file: {manifest_file_path}")
-                    manifest_file_path.unlink()
-                    stats['removed_count'] += 1
-                    logger.info(f"Removed manifest: {filename}")
-                except Exception as e:
-                    logger.error(f"Failed to remove manifest {filename}: {e}")
-                    logger.debug(f"Manifest removal exception for {filename}:", exc_info=True)
-            else:
-                logger.warning(f"Manifest file not found in depotcache, skipping: {filename}")
+        outcome = remove_manifest_files(depot_cache_path, manifest_filenames)
+        stats['removed_count'] = len(outcome['removed'])
+        if outcome['missing']:
+            logger.warning("%s manifest file(s) not found in depotcache, skipping: %s", len(outcome['missing']), ', '.join(outcome['missing']))
         
-        logger.info(f"Depot cache cleanup complete: {stats['removed_count']} specified manifest(s) removed")
+        logger.info("Depot cache cleanup complete: %s specified manifest(s) removed", stats['removed_count'])
         
     except Exception as e:
-        logger.error(f"Failed to cleanup depot cache: {e}")
+        logger.error("Failed to cleanup depot cache: %s", e)
         logger.debug("Depot cache cleanup exception:", exc_info=True)
     
     return stats
@@ -160,7 +516,7 @@ def get_depot_cache_info(steam_path: str) -> Dict[str, any]:
     Returns:
         Dict[str, any]: Information about depot cache
     """
-    logger.debug(f"Getting depot cache info for Steam path: {steam_path}")
+    logger.debug("Getting depot cache info for Steam path: %s", steam_path)
     
     info = {
         'path': '',
@@ -170,37 +526,39 @@ def get_depot_cache_info(steam_path: str) -> Dict[str, any]:
     }
     
     try:
-        # Convert to Path object
-        steam_path_obj = Path(steam_path)
-        depot_cache_path = steam_path_obj / 'depotcache'
+        depot_cache_path = os.path.join(steam_path, 'depotcache')
+        info['path'] = depot_cache_path
         
-        info['path'] = str(depot_cache_path)
-        info['exists'] = depot_cache_path.exists()
+        # Listing the folder doubles as the existence check, saving a separate
+        # exists() stat. Count and size the manifests in the same pass.
+        total_size = 0
+        try:
+            with os.scandir(depot_cache_path) as entries:
+                info['exists'] = True
+                for manifest_file in entries:
+                    if not _is_manifest(manifest_file):
+                        continue
+                    info['manifest_count'] += 1
+                    try:
+                        total_size += manifest_file.stat().st_size
+                    except Exception as e:
+                        logger.debug("Could not get size for %s: %s", manifest_file.name, e)
+                        pass  # Skip files we can't read
+        except FileNotFoundError:
+            pass
         
-        logger.debug(f"Depot cache path: {depot_cache_path}, exists: {info['exists']}")
+        logger.debug("Depot cache path: %s, exists: %s", depot_cache_path, info['exists'])
         
         if info['exists']:
-            manifest_files = list(depot_cache_path.glob("*.manifest"))
-            info['manifest_count'] = len(manifest_files)
-            
-            logger.debug(f"Found {info['manifest_count']} manifest files")
-            
-            total_size = 0
-            for manifest_file in manifest_files:
-                try:
-                    total_size += manifest_file.stat().st_size
-                except Exception as e:
-                    logger.debug(f"Could not get size for {manifest_file.name}: {e}")
-                    pass  # Skip files we can't read
-            
+            logger.debug("Found %s manifest files", info['manifest_count'])
             info['total_size_mb'] = total_size / (1024 * 1024)
-            logger.debug(f"Total depot cache size: {info['total_size_mb']:.2f} MB")
+            logger.debug("Total depot cache size: %.2f MB", info['total_size_mb'])
     
     except Exception as e:
-        logger.error(f"Failed to get depot cache info: {e}")
+        logger.error("Failed to get depot cache info: %s", e)
         logger.debug("Get depot cache info exception:", exc_info=True)
     
-    logger.info(f"Depot cache info: {info['manifest_count']} files, {info['total_size_mb']:.2f} MB")
+    logger.info("Depot cache info: %s files, %.2f MB", info['manifest_count'], info['total_size_mb'])
     return info
 
 
@@ -215,45 +573,28 @@ def clear_all_depot_cache(steam_path: str) -> Dict[str, int]:
         Dict[str, int]: Statistics with 'removed_count'
     """
     logger.info("Clearing all manifest files from depot cache")
-    logger.debug(f"Steam path: {steam_path}")
+    logger.debug("Steam path: %s", steam_path)
     
     stats = {'removed_count': 0}
     
     try:
-        # Convert to Path object
-        steam_path_obj = Path(steam_path)
-        
         # Construct depot cache path
-        depot_cache_path = steam_path_obj / 'depotcache'
-        logger.debug(f"Depot cache path: {depot_cache_path}")
+        depot_cache_path = os.path.join(steam_path, 'depotcache')
+        logger.debug("Depot cache path: %s", depot_cache_path)
         
-        if not depot_cache_path.exists():
-            logger.info(f"Depot cache directory does not exist: {depot_cache_path}")
-            return stats
+        # Remove every manifest file found in the depot cache; a missing folder
+        # simply lists nothing
+        outcome = remove_manifest_files(depot_cache_path)
+        stats['removed_count'] = len(outcome['removed'])
         
-        # Find all manifest files in depot cache
-        manifest_files = list(depot_cache_path.glob("*.manifest"))
-        logger.debug(f"Found {len(manifest_files)} manifest files to remove")
-        
-        if not manifest_files:
+        if not outcome['removed'] and not outcome['failed']:
             logger.info("No manifest files found in depot cache")
             return stats
         
-        # Remove all manifest files
-        for manifest_file in manifest_files:
-            try:
-                logger.debug(f"Removing manifest file: {manifest_file.name}")
-                manifest_file.unlink()
-                stats['removed_count'] += 1
-                logger.info(f"Removed manifest: {manifest_file.name}")
-            except Exception as e:
-                logger.error(f"Failed to remove manifest {manifest_file.name}: {e}")
-                logger.debug(f"Manifest removal exception for {manifest_file.name}:", exc_info=True)
-        
-        logger.info(f"Depot cache cleanup complete: {stats['removed_count']} files removed")
+        logger.info("Depot cache cleanup complete: %s files removed", stats['removed_count'])
         
     except Exception as e:
-        logger.error(f"Failed to clear depot cache: {e}")
+        logger.error("Failed to clear depot cache: %s", e)
         logger.debug("Clear depot cache exception:", exc_info=True)
     
     return stats
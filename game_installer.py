@@ -4,14 +4,16 @@
 # Handles the complete workflow for adding new games and removing existing ones.
 
 import logging
+import os
 from pathlib import Path
 import shutil
+import stat
 from typing import Dict, List, Optional
 from database_manager import get_database_manager
 from lua_parser import parse_lua_for_all_depots, parse_all_lua_files_structured
 from greenluma_manager import process_single_appid_for_greenluma, remove_appid_from_greenluma
-from vdf_updater import add_depots_to_config_vdf, remove_depots_from_config_vdf
-from depot_cache_manager import copy_manifests_for_appid, remove_manifests_for_appid
+from vdf_updater import add_depots_to_config_vdf, remove_depots_from_config_vdf, get_existing_depot_keys
+from depot_cache_manager import copy_manifests_for_appid, remove_manifests_for_appid, list_manifest_filenames, has_manifests
 from acfgen import generate_acf_for_appid
 from steam_game_search import get_game_name_by_appid
 from steamtools import copy_manifests_to_depotcache, copy_lua_to_stplug_in
@@ -22,6 +24,40 @@ from system_cleaner import uninstall_specific_appid
 logger = logging.getLogger(__name__)
 
 
+def _stat_or_none(path) -> Optional[os.stat_result]:
+    """
+    Stat a path in a single system call.
+    
+    Args:
+        path: Path to stat
+        
+    Returns:
+        os.stat_result: The result, or None if the path cannot be stat'ed
+    """
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _copy_validation(result: Dict[str, any]) -> Dict[str, any]:
+    """
+    Copy a validation result so callers cannot modify a cached one.
+    
+    Args:
+        result (Dict[str, any]): Result from validate_installation
+        
+    Returns:
+        Dict[str, any]: Copy with its own lists and components dict
+    """
+    return {
+        **result,
+        'errors': list(result['errors']),
+        'warnings': list(result['warnings']),
+        'components': dict(result['components'])
+    }
+
+
 class GameInstaller:
     """
     Handles the installation and uninstallation of games in SuperSexySteam.
@@ -50,8 +86,11 @@ class GameInstaller:
         self.steam_path = Path(steam_path_str) if steam_path_str else Path()
         self.greenluma_path = Path(greenluma_path_str) if greenluma_path_str else Path()
         
-        self.is_steam_path_valid = self.steam_path.exists() and self.steam_path.is_dir()
-        self.is_greenluma_path_valid = self.greenluma_path.exists() and self.greenluma_path.is_dir()
+        # One stat per path; is_dir() alone already implies exists()
+        steam_path_stat = _stat_or_none(self.steam_path)
+        greenluma_path_stat = _stat_or_none(self.greenluma_path)
+        self.is_steam_path_valid = steam_path_stat is not None and stat.S_ISDIR(steam_path_stat.st_mode)
+        self.is_greenluma_path_valid = greenluma_path_stat is not None and stat.S_ISDIR(greenluma_path_stat.st_mode)
         
         if not self.is_steam_path_valid:
             logger.warning(f"Steam path is not configured or invalid: '{self.steam_path}'")
@@ -62,6 +101,10 @@ class GameInstaller:
             logger.warning(f"GreenLuma path is not configured or invalid: '{self.greenluma_path}'")
         else:
             logger.info(f"GreenLuma path validated: {self.greenluma_path}")
+        
+        # validate_installation results per AppID, keyed on the state of the files
+        # they were derived from (see _validation_key)
+        self._validation_cache: Dict[str, tuple] = {}
             
         logger.info("GameInstaller initialization complete")
 
@@ -77,6 +120,7 @@ class GameInstaller:
             Dict[str, any]: Result dictionary with success status, errors, and statistics
         """
         logger.info(f"Starting installation for AppID {app_id}")
+        self._validation_cache.pop(app_id, None)
         logger.debug(f"Data folder: {data_folder}")
         
         result = {
@@ -125,8 +169,7 @@ class GameInstaller:
 
             # Step 3: Collect manifest file names for database tracking
             logger.debug(f"Collecting manifest files from: {data_folder_path}")
-            manifest_files = list(data_folder_path.glob("*.manifest"))
-            manifest_filenames = [f.name for f in manifest_files]
+            manifest_filenames = list_manifest_filenames(data_folder_path)
             result['stats']['manifests_tracked'] = len(manifest_filenames)
             logger.info(f"Found {len(manifest_filenames)} manifest files to track in database")
             logger.debug(f"Manifest files: {manifest_filenames}")
@@ -178,6 +221,7 @@ class GameInstaller:
             Dict[str, any]: Result dictionary with success status, errors, and statistics
         """
         logger.info(f"Continuing installation for AppID {app_id} after depot selection")
+        self._validation_cache.pop(app_id, None)
         logger.debug(f"Data folder: {data_folder}")
         
         result = {
@@ -382,6 +426,7 @@ class GameInstaller:
             Dict[str, any]: Result dictionary from the system_cleaner
         """
         logger.info(f"Delegating uninstallation of AppID {app_id} to system_cleaner for update")
+        self._validation_cache.pop(app_id, None)
         logger.debug(f"This unified function handles all aspects of uninstallation")
         # This unified function handles all aspects of uninstallation.
         # remove_data_folder is True because an update implies replacing the old data.
@@ -401,6 +446,7 @@ class GameInstaller:
             Dict[str, any]: Result dictionary with success status and details
         """
         logger.info(f"Removing depot {depot_id} from AppID {app_id}")
+        self._validation_cache.pop(app_id, None)
         
         result = {
             'success': False,
@@ -545,18 +591,27 @@ class GameInstaller:
             logger.error(f"Error removing depot {depot_id} from lua file {lua_file_path}: {e}")
             return False
     
-    def validate_installation(self, app_id: str) -> Dict[str, any]:
+    def validate_installation(self, app_id: str, _prefetched: Optional[Dict[str, any]] = None) -> Dict[str, any]:
         """
         Validate that a game is properly installed across all systems.
         
         Args:
             app_id (str): The Steam AppID to validate
+            _prefetched (Dict[str, any], optional): Dict shared by callers that validate many
+                AppIDs; holds the result of _prefetch_validation_inputs once first needed
             
         Returns:
             Dict[str, any]: Validation result with detailed status
         """
         logger.info(f"Validating installation for AppID {app_id}")
         
+        # Reuse the last result while nothing it was derived from has changed
+        key = self._validation_key(app_id)
+        cached = self._validation_cache.get(app_id)
+        if key is not None and cached is not None and cached[0] == key:
+            logger.debug(f"Using cached validation result for AppID {app_id}")
+            return _copy_validation(cached[1])
+        
         result = {
             'valid': True,
             'errors': [],
@@ -597,13 +652,19 @@ class GameInstaller:
             else:
                 logger.debug("Skipping GreenLuma validation - invalid path")
             
+            # config.vdf and the depot cache are shared by every AppID; a caller
+            # validating many AppIDs passes one dict that is filled on first use
+            if self.is_steam_path_valid:
+                if _prefetched is None:
+                    _prefetched = {}
+                if not _prefetched:
+                    _prefetched.update(self._prefetch_validation_inputs())
+            
             # Check Steam config.vdf
             if self.is_steam_path_valid:
                 logger.debug(f"Checking config.vdf for depot keys")
-                from vdf_updater import get_existing_depot_keys
-                config_vdf_path = self.steam_path / 'config' / 'config.vdf'
-                if config_vdf_path.exists():
-                    existing_keys = get_existing_depot_keys(str(config_vdf_path))
+                existing_keys = _prefetched['vdf_keys']
+                if existing_keys is not None:
                     if existing_keys:
                         result['components']['config_vdf'] = True
                         logger.debug(f"Config.vdf component validation: PASS - {len(existing_keys)} keys found")
@@ -612,26 +673,24 @@ class GameInstaller:
                         logger.debug(f"Config.vdf component validation: FAIL - {warning_msg}")
                         result['warnings'].append(warning_msg)
                 else:
-                    logger.warning(f"Config.vdf file not found: {config_vdf_path}")
+                    logger.warning(f"Config.vdf file not found: {self.steam_path / 'config' / 'config.vdf'}")
             else:
                 logger.debug("Skipping config.vdf validation - invalid Steam path")
             
             # Check manifests
             if self.is_steam_path_valid:
                 logger.debug("Checking depot cache for manifest files")
-                depotcache_path = self.steam_path / 'steamapps' / 'depotcache'
-                if depotcache_path.is_dir():
-                    manifest_count = len([f for f in depotcache_path.iterdir() 
-                                        if f.suffix == '.manifest'])
-                    if manifest_count > 0:
+                has_manifests = _prefetched['has_manifests']
+                if has_manifests is not None:
+                    if has_manifests:
                         result['components']['manifests'] = True
-                        logger.debug(f"Manifests component validation: PASS - {manifest_count} files found")
+                        logger.debug("Manifests component validation: PASS - manifest files found")
                     else:
                         warning_msg = "No manifest files found in depotcache"
                         logger.debug(f"Manifests component validation: FAIL - {warning_msg}")
                         result['warnings'].append(warning_msg)
                 else:
-                    logger.warning(f"Depot cache directory not found: {depotcache_path}")
+                    logger.warning(f"Depot cache directory not found: {self.steam_path / 'steamapps' / 'depotcache'}")
             else:
                 logger.debug("Skipping manifest validation - invalid Steam path")
             
@@ -662,10 +721,70 @@ class GameInstaller:
             logger.debug("Validation exception:", exc_info=True)
             result['errors'].append(error_msg)
             result['valid'] = False
+            # Don't keep a result cut short by an unexpected error
+            key = None
+        
+        if key is not None:
+            self._validation_cache[app_id] = (key, _copy_validation(result))
         
         logger.info(f"Validation complete for AppID {app_id}: valid={result['valid']}, errors={len(result['errors'])}, warnings={len(result['warnings'])}")
         return result
     
+    def _prefetch_validation_inputs(self) -> Dict[str, any]:
+        """
+        Read the Steam files that validate_installation checks every AppID against.
+        
+        Returns:
+            Dict[str, any]: 'vdf_keys' with the depot keys in config.vdf and 'has_manifests'
+                telling whether the depot cache holds any manifest, each None if the file or
+                folder is missing
+        """
+        prefetched = {'vdf_keys': None, 'has_manifests': None}
+        
+        config_vdf_path = self.steam_path / 'config' / 'config.vdf'
+        if config_vdf_path.exists():
+            prefetched['vdf_keys'] = get_existing_depot_keys(str(config_vdf_path))
+        
+        # Validation only needs to know whether any manifest exists, so stop at the first one
+        prefetched['has_manifests'] = has_manifests(str(self.steam_path / 'steamapps' / 'depotcache'))
+        
+        return prefetched
+    
+    def _validation_key(self, app_id: str) -> Optional[tuple]:
+        """
+        Capture the state validate_installation reads for an AppID.
+        
+        Uses one stat per file or folder: the GreenLuma AppList folder, config.vdf,
+        the depot cache folder and the AppID's ACF file. Adding or removing a file
+        changes its folder's modification time, so an unchanged key means an
+        unchanged validation result.
+        
+        Args:
+            app_id (str): The Steam AppID being validated
+            
+        Returns:
+            Optional[tuple]: The key, or None if it could not be computed
+        """
+        try:
+            paths = [
+                self.greenluma_path / 'NormalMode' / 'AppList',
+                self.steam_path / 'config' / 'config.vdf',
+                self.steam_path / 'steamapps' / 'depotcache',
+                self.steam_path / 'steamapps' / f"appmanifest_{app_id}.acf"
+            ]
+            mtimes = []
+            for path in paths:
+                path_stat = _stat_or_none(path)
+                mtimes.append(path_stat.st_mtime_ns if path_stat is not None else None)
+            return (
+                self.db.is_appid_exists(app_id),
+                self.config.getboolean('Settings', 'disable_acfgen', fallback=False),
+                *mtimes
+            )
+        except Exception as e:
+            logger.debug(f"Could not compute validation cache key for AppID {app_id}: {e}")
+            return None
+    
     def get_installation_status(self, app_id: str = None) -> Dict[str, any]:
         """
         Get detailed installation status for one or all games.
@@ -715,19 +834,23 @@ class GameInstaller:
                     logger.debug(f"AppID {app_id} not found in database")
             else:
                 # All games status
-                logger.debug("Getting all installed AppIDs from database")
-                all_appids = self.db.get_all_installed_appids()
-                status['total_games'] = len(all_appids)
-                status['installed_games'] = len(all_appids)
-                logger.info(f"Found {len(all_appids)} installed games in database")
+                logger.debug("Getting all installed AppIDs and their depots from database")
+                installed = self.db.get_installed_with_depots()
+                status['total_games'] = len(installed)
+                status['installed_games'] = len(installed)
+                logger.info(f"Found {len(installed)} installed games in database")
+                
+                # Parse config.vdf and list the depot cache at most once for all
+                # games instead of once per game; cached validations skip it entirely
+                prefetched = {}
                 
-                for appid in all_appids:
+                for appid, depots in installed.items():
                     logger.debug(f"Processing status for AppID {appid}")
                     game_info = {
                         'app_id': appid,
                         'is_installed': True,
-                        'depots': self.db.get_appid_depots(appid),
-                        'validation': self.validate_installation(appid)
+                        'depots': depots,
+                        'validation': self.validate_installation(appid, prefetched)
                     }
                     status['games'].append(game_info)
             
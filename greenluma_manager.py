@@ -92,9 +92,10 @@ def get_greenluma_applist_stats(gl_path):
         # Get database information for accurate categorization
         logger.debug("Getting database information for ID categorization")
         db = get_database_manager()
-        installed_appids = set(db.get_all_installed_appids())
-        all_depots = db.get_all_depots_for_installed_apps()
-        depot_ids = set(depot['depot_id'] for depot in all_depots)
+        # One query for the AppIDs and their depots instead of a round trip for each
+        installed = db.get_installed_with_depots()
+        installed_appids = set(installed)
+        depot_ids = set(depot['depot_id'] for depots in installed.values() for depot in depots)
         
         logger.debug(f"Found {len(installed_appids)} installed AppIDs and {len(depot_ids)} depot IDs in database")
         
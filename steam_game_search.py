@@ -6,6 +6,17 @@ import logging
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Shared session so repeated Steam Store API calls reuse keep-alive connections
+# instead of a new TLS handshake per request. The pool is sized for the concurrent
+# game name lookups in database_manager.update_missing_game_names.
+_session = requests.Session()
+_session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=16))
+
+# Names found by get_game_name_by_appid, so reinstalling or updating a game skips
+# the Steam Store round trip. Only real names are kept; the "AppID {appid}"
+# fallback after a failed lookup is retried on the next call.
+_game_name_cache: Dict[str, str] = {}
+
 def find_appid(game_name: str, cc: str = "us", lang: str = "en") -> int | None:
     """
     Search the Steam Store for a game by name and return its AppID.
@@ -30,7 +41,7 @@ def find_appid(game_name: str, cc: str = "us", lang: str = "en") -> int | None:
     
     try:
         logger.debug(f"Making request to Steam API: {url}")
-        resp = requests.get(url, params=params, timeout=10)
+        resp = _session.get(url, params=params, timeout=10)
         resp.raise_for_status()
 
         data = resp.json()
@@ -87,7 +98,7 @@ def search_games(game_name: str, max_results: int = 20, cc: str = "us", lang: st
     
     try:
         logger.debug(f"Making request to Steam API: {url}")
-        resp = requests.get(url, params=params, timeout=10)
+        resp = _session.get(url, params=params, timeout=10)
         resp.raise_for_status()
 
         data = resp.json()
@@ -141,7 +152,7 @@ def get_game_info(appid: int) -> Optional[Dict[str, any]]:
     
     try:
         logger.debug(f"Making request to Steam API: {url}")
-        resp = requests.get(url, params=params, timeout=10)
+        resp = _session.get(url, params=params, timeout=10)
         resp.raise_for_status()
         
         data = resp.json()
@@ -187,10 +198,16 @@ def get_game_name_by_appid(appid: str) -> str:
     """
     logger.debug(f"Getting game name for AppID: {appid}")
     
+    game_name = _game_name_cache.get(str(appid))
+    if game_name is not None:
+        logger.debug(f"Using cached game name for AppID {appid}: '{game_name}'")
+        return game_name
+    
     try:
         game_info = get_game_info(int(appid))
         if game_info and game_info.get("name"):
             game_name = game_info["name"]
+            _game_name_cache[str(appid)] = game_name
             logger.debug(f"Found game name for AppID {appid}: '{game_name}'")
             return game_name
         else:
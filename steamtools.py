@@ -8,6 +8,8 @@ from pathlib import Path
 import shutil
 from typing import Dict, List, Optional
 
+from depot_cache_manager import copy_manifest_files, remove_manifest_files
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -58,32 +60,19 @@ def copy_manifests_to_depotcache(steam_path: str, app_id: str, data_folder: str)
         depotcache_path.mkdir(parents=True, exist_ok=True)
         logger.debug(f"Depotcache directory: {depotcache_path}")
         
-        # Find all manifest files in data folder
-        manifest_files = list(data_folder_obj.glob("*.manifest"))
-        logger.info(f"Found {len(manifest_files)} manifest files to copy")
+        # Shares the skip check and concurrent copy with the depot cache manager.
+        # Manifests already up to date count as copied: they are in place.
+        outcome = copy_manifest_files(data_folder_obj, depotcache_path)
+        result['copied_files'] = outcome['copied'] + outcome['skipped']
+        result['copied_count'] = len(result['copied_files'])
+        result['warnings'].extend(outcome['failed'])
+        logger.info(f"Placed {result['copied_count']} manifest files ({len(outcome['skipped'])} already up to date)")
         
-        if not manifest_files:
+        if not result['copied_files'] and not outcome['failed']:
             logger.info("No manifest files found to copy")
             result['success'] = True
             return result
         
-        # Copy each manifest file
-        for manifest_file in manifest_files:
-            try:
-                dest_file = depotcache_path / manifest_file.name
-                logger.debug(f"Copying {manifest_file.name} to {dest_file}")
-                
-                # Copy the file
-                shutil.copy2(manifest_file, dest_file)
-                result['copied_count'] += 1
-                result['copied_files'].append(manifest_file.name)
-                logger.debug(f"Successfully copied: {manifest_file.name}")
-                
-            except Exception as e:
-                warning_msg = f"Failed to copy manifest file {manifest_file.name}: {e}"
-                logger.warning(warning_msg)
-                result['warnings'].append(warning_msg)
-        
         if result['copied_count'] > 0:
             result['success'] = True
             logger.info(f"Successfully copied {result['copied_count']} manifest files to depotcache")
@@ -216,11 +205,6 @@ def remove_manifests_from_depotcache(steam_path: str, app_id: str) -> Dict[str,
         
         depotcache_path = steam_path_obj / 'config' / 'depotcache'
         
-        if not depotcache_path.exists():
-            logger.info("Depotcache directory does not exist, nothing to remove")
-            result['success'] = True
-            return result
-        
         # Get depot IDs for this AppID from database to find related manifest files
         from database_manager import get_database_manager
         db = get_database_manager()
@@ -232,21 +216,10 @@ def remove_manifests_from_depotcache(steam_path: str, app_id: str) -> Dict[str,
             return result
         
         # Remove each manifest file by filename
-        for filename in manifest_filenames:
-            manifest_file = depotcache_path / filename
-            if manifest_file.exists():
-                try:
-                    manifest_file.unlink()
-                    result['removed_count'] += 1
-                    result['removed_files'].append(filename)
-                    logger.debug(f"Removed manifest file: {filename}")
-                    
-                except Exception as e:
-                    warning_msg = f"Failed to remove manifest file {filename}: {e}"
-                    logger.warning(warning_msg)
-                    result['warnings'].append(warning_msg)
-            else:
-                logger.debug(f"Manifest file not found in depotcache: {filename}")
+        outcome = remove_manifest_files(depotcache_path, manifest_filenames)
+        result['removed_files'] = outcome['removed']
+        result['removed_count'] = len(outcome['removed'])
+        result['warnings'].extend(outcome['failed'])
         
         result['success'] = True
         if result['removed_count'] > 0:
@@ -362,27 +335,11 @@ def clear_all_manifests_from_depotcache(steam_path: str) -> Dict[str, any]:
         
         depotcache_path = steam_path_obj / 'config' / 'depotcache'
         
-        if not depotcache_path.exists():
-            logger.info("Depotcache directory does not exist, nothing to clear")
-            result['success'] = True
-            return result
-        
-        # Find all manifest files
-        manifest_files = list(depotcache_path.glob("*.manifest"))
-        logger.info(f"Found {len(manifest_files)} manifest files to remove")
-        
-        # Remove each manifest file
-        for manifest_file in manifest_files:
-            try:
-                manifest_file.unlink()
-                result['removed_count'] += 1
-                result['removed_files'].append(manifest_file.name)
-                logger.debug(f"Removed manifest file: {manifest_file.name}")
-                
-            except Exception as e:
-                warning_msg = f"Failed to remove manifest file {manifest_file.name}: {e}"
-                logger.warning(warning_msg)
-                result['warnings'].append(warning_msg)
+        # Remove every manifest file in the folder; a missing folder lists nothing
+        outcome = remove_manifest_files(depotcache_path)
+        result['removed_files'] = outcome['removed']
+        result['removed_count'] = len(outcome['removed'])
+        result['warnings'].extend(outcome['failed'])
         
         result['success'] = True
         if result['removed_count'] > 0:
@@ -538,4 +495,4 @@ def validate_steam_directories(steam_path: str) -> Dict[str, any]:
         logger.debug("Directory validation exception:", exc_info=True)
         result['errors'].append(error_msg)
     
-    return result
\ No newline at end of file
+    return result
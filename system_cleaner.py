@@ -3,6 +3,7 @@
 # A module for comprehensive system cleaning and uninstallation operations.
 # Provides functions to completely clear all data or uninstall specific AppIDs.
 
+from concurrent.futures import ThreadPoolExecutor
 import shutil
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -95,8 +96,10 @@ def clear_all_data(config) -> Dict[str, any]:
         
         # Step 2: Get all data before clearing database
         db = get_database_manager()
-        installed_appids = db.get_all_installed_appids()
-        all_depots = db.get_all_depots_for_installed_apps()
+        # One query for the AppIDs and their depots instead of a round trip for each
+        installed = db.get_installed_with_depots()
+        installed_appids = list(installed)
+        all_depots = [depot for depots in installed.values() for depot in depots]
         
         logger.info(f"Found {len(installed_appids)} installed AppIDs and {len(all_depots)} depots")
         
@@ -259,6 +262,8 @@ def clear_all_data(config) -> Dict[str, any]:
         
         # Step 9: Clear database (do this last)
         try:
+            # Release open connections so the file can be removed
+            db.close()
             db_file = Path('supersexysteam.db')
             if db_file.exists():
                 db_file.unlink()
@@ -335,129 +340,149 @@ def uninstall_specific_appid(config, app_id: str) -> Dict[str, any]:
         manifest_filenames = db.get_manifests_for_appid(app_id)
         logger.info(f"Found {len(depots)} depots and {len(manifest_filenames)} manifests for AppID {app_id}")
         
-        # Step 3: Remove depot keys from config.vdf
-        if steam_path:
+        # Steps 3-6 each clean up a different file or folder and depend only on the
+        # depot and manifest lists read above, so they run concurrently. Each step
+        # collects its own warnings; they are merged in step order afterwards so the
+        # result reads the same as when the steps ran one after another.
+        def remove_config_vdf_keys(warnings: List[str]):
+            # Step 3: Remove depot keys from config.vdf
             # Check if VDF parsing is disabled in config
             disable_vdf_parsing = config.getboolean('Settings', 'disable_vdf_parsing', fallback=False)
             if disable_vdf_parsing:
                 logger.info(f"VDF parsing is disabled in config, skipping config.vdf update for AppID {app_id}")
                 result['stats']['vdf_parsing_skipped'] = True
-            else:
-                try:
-                    config_vdf_path = steam_path / 'config' / 'config.vdf'
-                    depots_with_keys = [d for d in depots if 'depot_key' in d]
-                    if depots_with_keys:
-                        if remove_depots_from_config_vdf(str(config_vdf_path), depots_with_keys):
-                            result['stats']['depot_keys_removed'] = len(depots_with_keys)
-                            logger.info(f"Removed {len(depots_with_keys)} depot keys from config.vdf")
-                        else:
-                            result['warnings'].append("Failed to update config.vdf")
+                return
+            try:
+                config_vdf_path = steam_path / 'config' / 'config.vdf'
+                depots_with_keys = [d for d in depots if 'depot_key' in d]
+                if depots_with_keys:
+                    if remove_depots_from_config_vdf(str(config_vdf_path), depots_with_keys):
+                        result['stats']['depot_keys_removed'] = len(depots_with_keys)
+                        logger.info(f"Removed {len(depots_with_keys)} depot keys from config.vdf")
                     else:
-                        logger.info("No depot keys to remove from config.vdf")
-                except Exception as e:
-                    result['warnings'].append(f"Config.vdf cleanup failed: {e}")
-                    logger.warning(f"Config.vdf cleanup failed: {e}")
+                        warnings.append("Failed to update config.vdf")
+                else:
+                    logger.info("No depot keys to remove from config.vdf")
+            except Exception as e:
+                warnings.append(f"Config.vdf cleanup failed: {e}")
+                logger.warning(f"Config.vdf cleanup failed: {e}")
         
-        # Step 4: Remove manifest files from depot cache
-        if steam_path:
+        def remove_depot_cache_manifests(warnings: List[str]):
+            # Step 4: Remove manifest files from depot cache
             # Check if depot cache manager is disabled in config
             disable_depotcache_manager = config.getboolean('Settings', 'disable_depotcache_manager', fallback=False)
             if disable_depotcache_manager:
                 logger.info(f"Depot cache manager is disabled in config, skipping depot cache cleanup for AppID {app_id}")
                 result['stats']['depotcache_manager_skipped'] = True
-            else:
-                try:
-                    manifest_stats = remove_manifests_for_appid(str(steam_path), manifest_filenames)
-                    result['stats']['manifest_files_removed'] = manifest_stats.get('removed_count', 0)
-                    if manifest_stats.get('removed_count', 0) > 0:
-                        logger.info(f"Removed {manifest_stats['removed_count']} manifest files from depot cache")
-                except Exception as e:
-                    result['warnings'].append(f"Depot cache cleanup failed: {e}")
-                    logger.warning(f"Depot cache cleanup failed: {e}")
+                return
+            try:
+                manifest_stats = remove_manifests_for_appid(str(steam_path), manifest_filenames)
+                result['stats']['manifest_files_removed'] = manifest_stats.get('removed_count', 0)
+                if manifest_stats.get('removed_count', 0) > 0:
+                    logger.info(f"Removed {manifest_stats['removed_count']} manifest files from depot cache")
+            except Exception as e:
+                warnings.append(f"Depot cache cleanup failed: {e}")
+                logger.warning(f"Depot cache cleanup failed: {e}")
         
-        # Step 4.5: Remove manifest files from Steam's depotcache directory
-        if steam_path:
+        def remove_steamtools_manifests(warnings: List[str]):
+            # Step 4.5: Remove manifest files from Steam's depotcache directory
             # Check if steamtools is disabled in config
             disable_steamtools = config.getboolean('Settings', 'disable_steamtools', fallback=True)
             if disable_steamtools:
                 logger.info(f"Steamtools is disabled in config, skipping Steam depotcache cleanup for AppID {app_id}")
                 result['stats']['steamtools_skipped'] = True
-            else:
-                try:
-                    steam_manifest_result = remove_manifests_from_depotcache(str(steam_path), app_id)
-                    if steam_manifest_result['success']:
-                        result['stats']['steam_manifests_removed'] = steam_manifest_result.get('removed_count', 0)
-                        if steam_manifest_result.get('removed_count', 0) > 0:
-                            logger.info(f"Removed {steam_manifest_result['removed_count']} manifest files from Steam depotcache")
-                    else:
-                        if steam_manifest_result.get('errors'):
-                            result['warnings'].extend(steam_manifest_result['errors'])
-                        if steam_manifest_result.get('warnings'):
-                            result['warnings'].extend(steam_manifest_result['warnings'])
-                except Exception as e:
-                    result['warnings'].append(f"Steam depotcache cleanup failed: {e}")
-                    logger.warning(f"Steam depotcache cleanup failed: {e}")
+                return
+            try:
+                steam_manifest_result = remove_manifests_from_depotcache(str(steam_path), app_id)
+                if steam_manifest_result['success']:
+                    result['stats']['steam_manifests_removed'] = steam_manifest_result.get('removed_count', 0)
+                    if steam_manifest_result.get('removed_count', 0) > 0:
+                        logger.info(f"Removed {steam_manifest_result['removed_count']} manifest files from Steam depotcache")
+                else:
+                    if steam_manifest_result.get('errors'):
+                        warnings.extend(steam_manifest_result['errors'])
+                    if steam_manifest_result.get('warnings'):
+                        warnings.extend(steam_manifest_result['warnings'])
+            except Exception as e:
+                warnings.append(f"Steam depotcache cleanup failed: {e}")
+                logger.warning(f"Steam depotcache cleanup failed: {e}")
         
-        # Step 4.6: Remove lua file from Steam's stplug-in directory
-        if steam_path:
+        def remove_steamtools_lua(warnings: List[str]):
+            # Step 4.6: Remove lua file from Steam's stplug-in directory
             # Check if steamtools is disabled in config
             disable_steamtools = config.getboolean('Settings', 'disable_steamtools', fallback=True)
             if disable_steamtools:
                 logger.info(f"Steamtools is disabled in config, skipping Steam stplug-in cleanup for AppID {app_id}")
-                if 'steamtools_skipped' not in result['stats']:
-                    result['stats']['steamtools_skipped'] = True
-            else:
-                try:
-                    steam_lua_result = remove_lua_from_stplug_in(str(steam_path), app_id)
-                    if steam_lua_result['success']:
-                        if steam_lua_result.get('removed_file'):
-                            result['stats']['steam_lua_removed'] = True
-                            logger.info(f"Removed lua file from Steam stplug-in: {steam_lua_result['removed_file']}")
-                        else:
-                            logger.info("No lua file found in Steam stplug-in to remove")
+                result['stats']['steamtools_skipped'] = True
+                return
+            try:
+                steam_lua_result = remove_lua_from_stplug_in(str(steam_path), app_id)
+                if steam_lua_result['success']:
+                    if steam_lua_result.get('removed_file'):
+                        result['stats']['steam_lua_removed'] = True
+                        logger.info(f"Removed lua file from Steam stplug-in: {steam_lua_result['removed_file']}")
                     else:
-                        if steam_lua_result.get('errors'):
-                            result['warnings'].extend(steam_lua_result['errors'])
-                        if steam_lua_result.get('warnings'):
-                            result['warnings'].extend(steam_lua_result['warnings'])
-                except Exception as e:
-                    result['warnings'].append(f"Steam stplug-in cleanup failed: {e}")
-                    logger.warning(f"Steam stplug-in cleanup failed: {e}")
+                        logger.info("No lua file found in Steam stplug-in to remove")
+                else:
+                    if steam_lua_result.get('errors'):
+                        warnings.extend(steam_lua_result['errors'])
+                    if steam_lua_result.get('warnings'):
+                        warnings.extend(steam_lua_result['warnings'])
+            except Exception as e:
+                warnings.append(f"Steam stplug-in cleanup failed: {e}")
+                logger.warning(f"Steam stplug-in cleanup failed: {e}")
         
-        # Step 5: Remove specific AppID folder from data directory
-        try:
-            appid_data_folder = script_dir / "data" / app_id
-            
-            if appid_data_folder.exists():
-                shutil.rmtree(appid_data_folder)
-                result['stats']['data_folder_removed'] = True
-                logger.info(f"Removed data folder for AppID {app_id}")
-            else:
-                logger.info(f"Data folder for AppID {app_id} does not exist")
-                result['stats']['data_folder_removed'] = True
-        except Exception as e:
-            result['warnings'].append(f"Data folder cleanup failed: {e}")
-            logger.warning(f"Data folder cleanup failed: {e}")
+        def remove_data_folder(warnings: List[str]):
+            # Step 5: Remove specific AppID folder from data directory
+            try:
+                appid_data_folder = script_dir / "data" / app_id
+                
+                if appid_data_folder.exists():
+                    shutil.rmtree(appid_data_folder)
+                    result['stats']['data_folder_removed'] = True
+                    logger.info(f"Removed data folder for AppID {app_id}")
+                else:
+                    logger.info(f"Data folder for AppID {app_id} does not exist")
+                    result['stats']['data_folder_removed'] = True
+            except Exception as e:
+                warnings.append(f"Data folder cleanup failed: {e}")
+                logger.warning(f"Data folder cleanup failed: {e}")
         
-        # Step 6: Remove from GreenLuma
-        if greenluma_path:
+        def remove_greenluma_entries(warnings: List[str]):
+            # Step 6: Remove from GreenLuma
             # Check if GreenLuma is disabled in config
             disable_greenluma = config.getboolean('Settings', 'disable_greenluma', fallback=False)
             if disable_greenluma:
                 logger.info(f"GreenLuma is disabled in config, skipping GreenLuma removal for AppID {app_id}")
                 result['stats']['greenluma_skipped'] = True
-            else:
-                try:
-                    greenluma_result = remove_appid_from_greenluma(str(greenluma_path), app_id, depots)
-                    if greenluma_result['success']:
-                        total_removed = greenluma_result['stats'].get('appids_removed', 0) + greenluma_result['stats'].get('depots_removed', 0)
-                        result['stats']['greenluma_files_removed'] = total_removed
-                        logger.info(f"Removed {total_removed} entries from GreenLuma AppList")
-                    else:
-                        result['warnings'].extend(greenluma_result.get('errors', []))
-                except Exception as e:
-                    result['warnings'].append(f"GreenLuma removal failed: {e}")
-                    logger.warning(f"GreenLuma removal failed: {e}")
+                return
+            try:
+                greenluma_result = remove_appid_from_greenluma(str(greenluma_path), app_id, depots)
+                if greenluma_result['success']:
+                    total_removed = greenluma_result['stats'].get('appids_removed', 0) + greenluma_result['stats'].get('depots_removed', 0)
+                    result['stats']['greenluma_files_removed'] = total_removed
+                    logger.info(f"Removed {total_removed} entries from GreenLuma AppList")
+                else:
+                    warnings.extend(greenluma_result.get('errors', []))
+            except Exception as e:
+                warnings.append(f"GreenLuma removal failed: {e}")
+                logger.warning(f"GreenLuma removal failed: {e}")
+        
+        cleanup_steps = []
+        if steam_path:
+            cleanup_steps += [remove_config_vdf_keys, remove_depot_cache_manifests,
+                              remove_steamtools_manifests, remove_steamtools_lua]
+        cleanup_steps.append(remove_data_folder)
+        if greenluma_path:
+            cleanup_steps.append(remove_greenluma_entries)
+        
+        step_warnings = [[] for _ in cleanup_steps]
+        with ThreadPoolExecutor(max_workers=len(cleanup_steps)) as executor:
+            futures = [executor.submit(step, warnings) for step, warnings in zip(cleanup_steps, step_warnings)]
+            for future in futures:
+                future.result()
+        for warnings in step_warnings:
+            result['warnings'].extend(warnings)
         
         # Step 7: Remove from database (do this last)
         try: